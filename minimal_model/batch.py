@@ -0,0 +1,139 @@
+import json
+import math
+import os
+import signal
+import sys
+import time
+from typing import Iterable, Iterator, List
+
+import minimal_model.utils
+import minimal_model.portfolio
+from minimal_model.processes import Workers, worker_options
+
+CNF_SUFFIXES = ('.cnf', '.cnf.gz', '.cnf.xz', '.cnf.bz2', '.cnf.lzma')
+
+
+def collect_files(paths: Iterable[str], manifest=None) -> List[str]:
+    """
+    collect CNF files to solve
+    :param paths: files or directories, directories are searched recursively for files ending with `CNF_SUFFIXES`
+    :param manifest: a file which has one path per line, blank lines and lines starting with `#` are skipped
+    """
+    paths = list(paths)
+    if manifest:
+        with open(manifest) as f:
+            paths.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        for (root, dirs, names) in os.walk(path):
+            dirs.sort()
+            files.extend(os.path.join(root, name) for name in sorted(names) if name.endswith(CNF_SUFFIXES))
+    return files
+
+
+def solve_file(path, name='MM', time_limit=0, mem_limit=0, stats=False, **kwargs) -> dict:
+    """
+    compute a minimal model of a CNF file, the limits are set on the current process
+    :param stats: add `stats`, the time of every phase and the counters, to the record
+    :param kwargs: the parameters of `minimal_model.solvers.Solver`, such as mr and pysat_name
+    :return: a record of the result
+    """
+    from minimal_model.dimacs import iter_clauses
+    minimal_model.utils.limit_memory(mem_limit)
+    minimal_model.utils.limit_time(int(math.ceil(time_limit)))
+    record = {'file': path}
+    record.update(solve_clauses(iter_clauses(path), name, stats, **kwargs))
+    return record
+
+
+def solve_clauses(clauses, name='MM', stats=False, **kwargs) -> dict:
+    """
+    compute a minimal model of clauses, errors are reported by the status of the record instead of raised
+    :param clauses: a CNF formula or an iterable of clauses
+    :param stats: add `stats`, the time of every phase and the counters, to the record
+    :param kwargs: the parameters of `minimal_model.solvers.Solver`, such as mr and pysat_name
+    :return: a record of the result
+    """
+    from minimal_model.solvers import Solver
+    record = {}
+    try:
+        solver = Solver(name, **kwargs)
+        solver.append_formula(clauses)
+        (sat, model) = solver.compute_minimal_model()
+        record.update(status='SATISFIABLE' if sat else 'UNSATISFIABLE', sat=sat, model=model,
+                      cpu_time=solver.cpu_time, compute_model_count=solver.compute_model_count,
+                      check_model_count=solver.check_model_count)
+        if not solver.proven_minimal:
+            # computing was stopped by the deadline or the memory watermark
+            record['proven_minimal'] = False
+        if solver.winner is not None:
+            record['winner'] = minimal_model.portfolio.format_configuration(solver.winner)
+        if stats:
+            record['stats'] = solver.stats.to_dict()
+    except minimal_model.utils.DeadlineReached:
+        # the deadline was reached before any model was found
+        record.update(status='TIMEOUT')
+    except MemoryError:
+        record.update(status='MEMOUT')
+    except Exception as e:
+        record.update(status='ERROR', error='{}: {}'.format(type(e).__name__, e))
+    return record
+
+
+def _work(connection, path, options):
+    connection.send(solve_file(path, **options))
+
+
+def solve_files(files: Iterable[str], jobs=None, time_limit=0, mem_limit=0, **options) -> Iterator[dict]:
+    """
+    compute minimal models of many CNF files, every file is solved by a new worker process, and at most `jobs`
+    workers run at the same time. Records are yielded as soon as workers finish, so their order may differ from files.
+    :param jobs: the count of workers, default is the count of CPUs
+    :param time_limit: the wall clock seconds a file can use, zero is unlimited
+    :param mem_limit: the megabytes of memory a worker can use, zero is unlimited
+    :param options: the parameters of `solve_file`, such as name, mr and pysat_name
+    """
+    jobs = jobs or os.cpu_count() or 1
+    pending = iter(files)
+    options = worker_options(dict(options, time_limit=time_limit, mem_limit=mem_limit))
+    # workers run in their own process groups, so processes started by the solver are killed with them
+    with Workers(method=None, group=True) as workers:
+        while True:
+            while len(workers) < jobs:
+                path = next(pending, None)
+                if path is None:
+                    break
+                workers.start(_work, path, options, tag=(path, time.monotonic() + time_limit if time_limit else None))
+            if not workers:
+                return
+            deadlines = [deadline for (_, deadline) in (worker.tag for worker in workers) if deadline is not None]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            for worker in workers.wait(timeout):
+                record = worker.recv()
+                workers.finish(worker)
+                if 'status' not in record:
+                    status = 'TIMEOUT' if worker.process.exitcode == -signal.SIGXCPU else 'ERROR'
+                    record = {'file': worker.tag[0], 'status': status, 'error': 'worker {}'.format(record['error'])}
+                yield record
+            now = time.monotonic()
+            for worker in workers:
+                (path, deadline) = worker.tag
+                if deadline is not None and deadline <= now:
+                    workers.kill(worker)
+                    yield {'file': path, 'status': 'TIMEOUT'}
+
+
+def write_records(records: Iterable[dict], stream=None, simply=False):
+    """
+    write records as JSON lines, one line per record is flushed as soon as it is written
+    :param simply: only write the positive atoms of models
+    """
+    stream = stream or sys.stdout
+    for record in records:
+        if simply and record.get('model'):
+            record['model'] = [x for x in record['model'] if x > 0]
+        stream.write(json.dumps(record) + '\n')
+        stream.flush()
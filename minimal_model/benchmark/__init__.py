@@ -0,0 +1,2 @@
+from minimal_model.benchmark.generators import GENERATORS, generate, random_3cnf, positive_cycles, horn_heavy, sparse
+from minimal_model.benchmark.runner import ALGORITHMS, run_case, sweep, compare, load_results
@@ -0,0 +1,91 @@
+import random
+from typing import List
+
+
+def random_3cnf(size, seed=0, ratio=4.26) -> List[List[int]]:
+    """
+    random 3-CNF near the phase transition
+    :param size: the count of atoms
+    :param ratio: the count of clauses per atom
+    """
+    rand = random.Random(seed)
+    clauses = []
+    for _ in range(int(size * ratio)):
+        atoms = rand.sample(range(1, size + 1), 3)
+        clauses.append([x if rand.random() < 0.5 else -x for x in atoms])
+    return clauses
+
+
+def positive_cycles(size, seed=0, cycle_length=None) -> List[List[int]]:
+    """
+    disjunctive programs whose atoms are in long positive cycles, so the dependency graph has a few large strongly
+    connected components
+    :param size: the count of atoms
+    :param cycle_length: the count of atoms in a cycle, default is a quarter of size
+    """
+    rand = random.Random(seed)
+    cycle_length = max(2, min(size, cycle_length or size // 4))
+    atoms = list(range(1, size + 1))
+    rand.shuffle(atoms)
+    cycles = [atoms[i:i + cycle_length] for i in range(0, size, cycle_length)]
+    clauses = []
+    for cycle in cycles:
+        # a -> b for every neighbour of the cycle
+        for (a, b) in zip(cycle, cycle[1:] + cycle[:1]):
+            clauses.append([-a, b])
+        # rules with a body, which connect the cycles
+        for _ in range(len(cycle) // 2):
+            body = rand.choice(atoms)
+            clauses.append([-body] + rand.sample(cycle, min(2, len(cycle))))
+    # disjunctive facts, every model has to choose one of their atoms
+    for _ in range(max(1, size // 10)):
+        clauses.append(rand.sample(atoms, min(3, size)))
+    return clauses
+
+
+def horn_heavy(size, seed=0, horn_ratio=0.9) -> List[List[int]]:
+    """
+    formulas whose clauses are mostly Horn clauses
+    :param size: the count of atoms
+    :param horn_ratio: the ratio of Horn clauses, the others have two positive atoms
+    """
+    rand = random.Random(seed)
+    atoms = range(1, size + 1)
+    clauses = [[x] for x in rand.sample(atoms, max(1, size // 20))]
+    for _ in range(size * 3):
+        picked = rand.sample(atoms, min(size, 4))
+        # the head is never in the body, so setting all atoms true is a model
+        heads = 1 if rand.random() < horn_ratio or len(picked) < 3 else 2
+        clauses.append(picked[:heads] + [-x for x in picked[heads:heads + rand.randint(1, 2)]])
+    return clauses
+
+
+def sparse(size, seed=0, ratio=2.0) -> List[List[int]]:
+    """
+    large sparse formulas, clauses have two or three literals and most literals are positive
+    :param size: the count of atoms
+    :param ratio: the count of clauses per atom
+    """
+    rand = random.Random(seed)
+    clauses = []
+    for _ in range(int(size * ratio)):
+        atoms = rand.sample(range(1, size + 1), rand.randint(2, 3))
+        clauses.append([x if rand.random() < 0.6 else -x for x in atoms])
+    return clauses
+
+
+GENERATORS = {
+    'random3': random_3cnf,
+    'cycles': positive_cycles,
+    'horn': horn_heavy,
+    'sparse': sparse,
+}
+
+
+def generate(family, size, seed=0) -> List[List[int]]:
+    """
+    generate the formula of a family in `GENERATORS`, the same family, size and seed always give the same formula
+    """
+    if family not in GENERATORS:
+        raise ValueError('no generator named [{}]'.format(family))
+    return GENERATORS[family](size, seed)
@@ -0,0 +1,118 @@
+import json
+import time
+from itertools import product
+from typing import Iterable, Iterator, List
+
+import minimal_model.portfolio
+from minimal_model.processes import Workers
+from minimal_model.benchmark.generators import GENERATORS, generate
+
+ALGORITHMS = (('MM', False), ('MR', False), ('MM', True), ('MR', True), ('SCC', False))
+
+
+def case_key(record) -> tuple:
+    """
+    the key of a case, records of the same case are compared with each other. Records written before `preprocess`
+    was recorded were preprocessed
+    """
+    return record['family'], record['size'], record['seed'], record['configuration'], record.get('preprocess', True)
+
+
+def _work(connection, family, size, seed, configuration, preprocess):
+    from minimal_model.solvers import Solver
+    (name, mr, pysat_name) = configuration
+    clauses = generate(family, size, seed)
+    solver = Solver(name, mr=mr, pysat_name=pysat_name, preprocess=preprocess)
+    solver.append_formula(clauses)
+    start = time.perf_counter()
+    (sat, model) = solver.compute_minimal_model()
+    wall_time = time.perf_counter() - start
+    stats = solver.stats.to_dict()
+    record = {'status': 'SATISFIABLE' if sat else 'UNSATISFIABLE', 'wall_time': wall_time,
+              'cpu_time': solver.cpu_time, 'sat_calls': stats['counters'].get('sat_calls', 0),
+              'compute_model_count': solver.compute_model_count, 'check_model_count': solver.check_model_count,
+              'peak_rss_mb': stats['peak_rss_mb']}
+    if sat:
+        # checked after the time is taken, so checking isn't counted in the time of the case
+        check = solver.check_models([model], jobs=1)[0]
+        record.update(satisfied=check['satisfied'], minimal=check['minimal'])
+    connection.send(record)
+
+
+def run_case(family, size, seed, configuration, timeout=None, preprocess=False) -> dict:
+    """
+    run a case in a new process, so the peak memory is the peak of the case only
+    :param configuration: (name, mr, pysat_name)
+    :param timeout: wall clock seconds, None is unlimited
+    :param preprocess: whether the formula is preprocessed before it is given to the algorithm
+    :return: a record of the case, the model of a satisfiable case is checked by `minimal_model.minimality`, and
+    `satisfied` and `minimal` are its result
+    """
+    configuration = tuple(configuration)
+    record = {'family': family, 'size': size, 'seed': seed,
+              'configuration': minimal_model.portfolio.format_configuration(configuration), 'preprocess': preprocess}
+    # the case runs in its own process group, so it can solve components or a portfolio by processes
+    with Workers(method=None, group=True) as workers:
+        worker = workers.start(_work, family, size, seed, configuration, preprocess)
+        if not workers.wait(timeout):
+            record['status'] = 'TIMEOUT'
+            return record
+        record.update(worker.recv())
+        workers.finish(worker)
+    # a case which raised or exited has only `error`
+    record.setdefault('status', 'ERROR')
+    return record
+
+
+def sweep(families: Iterable[str] = tuple(GENERATORS), sizes: Iterable[int] = (100, 200, 400),
+          algorithms=ALGORITHMS, pysat_names: Iterable[str] = ('m22',), seeds: Iterable[int] = (0,),
+          timeout=None, preprocess=False) -> Iterator[dict]:
+    """
+    run every case of family × size × seed × algorithm × pysat backend one by one, records are yielded as soon as
+    cases finish
+    :param algorithms: a list of (name, mr)
+    :param preprocess: whether formulas are preprocessed, see `run_case`
+    """
+    for (family, size, seed, (name, mr), pysat_name) in product(families, sizes, seeds, algorithms, pysat_names):
+        yield run_case(family, size, seed, (name, mr, pysat_name), timeout, preprocess)
+
+
+def load_results(path) -> List[dict]:
+    """
+    load records written as JSON lines
+    """
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(records: Iterable[dict], baseline: Iterable[dict], threshold=1.2, min_time=0.05) -> List[dict]:
+    """
+    compare records with the records of a baseline
+    :param threshold: a case regresses if its time is more than threshold times the time of the baseline
+    :param min_time: cases faster than it in both records are skipped, their time is mostly noise
+    :return: a record per case in both, `ratio` is time divided by the time of the baseline and `regression` is
+    whether it regresses. A case which times out, has a different answer from the baseline or whose model isn't a
+    minimal model (`invalid`) is a regression too
+    """
+    base = {case_key(record): record for record in baseline}
+    result = []
+    for record in records:
+        old = base.get(case_key(record))
+        if old is None:
+            continue
+        item = {'family': record['family'], 'size': record['size'], 'seed': record['seed'],
+                'configuration': record['configuration'], 'preprocess': record.get('preprocess', True),
+                'status': record['status'],
+                'baseline_status': old['status']}
+        if record['status'] == 'SATISFIABLE' and not (record.get('satisfied', True) and record.get('minimal', True)):
+            item['invalid'] = True
+            item['regression'] = True
+        elif 'TIMEOUT' in (record['status'], old['status']):
+            item['regression'] = record['status'] == 'TIMEOUT' and old['status'] != 'TIMEOUT'
+        elif record['status'] != old['status'] or record['status'] == 'ERROR':
+            item['regression'] = record['status'] != old['status']
+        else:
+            item['ratio'] = record['wall_time'] / max(old['wall_time'], 1e-9)
+            item['regression'] = max(record['wall_time'], old['wall_time']) >= min_time and item['ratio'] > threshold
+        result.append(item)
+    return result
@@ -0,0 +1,133 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Iterable, Optional, Tuple
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'minimal_model', 'results.sqlite')
+
+# the options of a solver which don't change its result, they aren't a part of the key
+IGNORED_OPTIONS = ('bootstrap_with', 'jobs', 'timeout', 'deadline', 'memory_watermark')
+
+
+def formula_key(clauses: Iterable, options: dict = None) -> str:
+    """
+    the canonical hash of a clause set and the options of a solver, the order of clauses and the order of literals in
+    a clause don't change it, neither do repeated clauses and literals
+    :param options: the name, mr and the parameters of the solver
+    """
+    canonical = sorted({tuple(sorted(set(clause))) for clause in clauses})
+    digest = hashlib.sha256()
+    for (name, value) in sorted((options or {}).items()):
+        if name not in IGNORED_OPTIONS:
+            digest.update('{}={!r};'.format(name, value).encode())
+    flat = array('i')
+    for clause in canonical:
+        flat.extend(clause)
+        flat.append(0)
+    digest.update(flat.tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache(object):
+    """
+    results of computing minimal models, stored in a sqlite database on local disk and keyed by `formula_key`. \n
+    The least recently used results are evicted when the results take more than `max_size` bytes. Several processes
+    can share the same database, sqlite locks it while it is written.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_size=256 * 1024 * 1024):
+        """
+        :param path: the path of the database, its directory is created if it doesn't exist
+        :param max_size: the max bytes of stored models
+        """
+        self.path = path
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # a connection can't be used by a forked process, every process opens its own
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=60, check_same_thread=False, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, sat INTEGER, nv INTEGER, '
+                               'positive BLOB, size INTEGER, used REAL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS results_used ON results (used)')
+            (self._connection, self._pid) = (connection, os.getpid())
+        return self._connection
+
+    def get(self, key) -> Optional[Tuple[bool, list]]:
+        """
+        :return: (satisfiability, minimal model) stored with key, None if there isn't
+        """
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute('SELECT sat, nv, positive FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            connection.execute('UPDATE results SET used = ? WHERE key = ?', (time.time(), key))
+            self.hits += 1
+        (sat, nv, positive) = row
+        if not sat:
+            return False, None
+        true = set(array('i', positive))
+        return True, [x if x in true else -x for x in range(1, nv + 1)]
+
+    def put(self, key, sat, model):
+        """
+        store a result, the least recently used results are evicted if the database is too large
+        """
+        positive = array('i', [x for x in model if x > 0] if sat else []).tobytes()
+        nv = len(model) if sat else 0
+        size = len(positive) + len(key)
+        with self._lock:
+            connection = self._connect()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                                   (key, int(bool(sat)), nv, positive, size, time.time()))
+                self._evict(connection)
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+
+    def _evict(self, connection):
+        (total,) = connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()
+        if total <= self.max_size:
+            return
+        evicted = []
+        for (key, size) in connection.execute('SELECT key, size FROM results ORDER BY used'):
+            if total <= self.max_size:
+                break
+            evicted.append((key,))
+            total -= size
+        connection.executemany('DELETE FROM results WHERE key = ?', evicted)
+
+    def __len__(self):
+        with self._lock:
+            (count,) = self._connect().execute('SELECT COUNT(*) FROM results').fetchone()
+        return count
+
+    def clear(self):
+        """
+        delete all stored results, the counters are kept
+        """
+        with self._lock:
+            self._connect().execute('DELETE FROM results')
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
@@ -0,0 +1,404 @@
+import mmap
+from array import array
+from itertools import chain
+from typing import List
+
+import numpy as np
+
+from minimal_model.graph import CompactGraph
+
+# the count of literals a `ClauseBuffer` keeps in memory before writing them to its file
+FLUSH_SIZE = 1 << 20
+
+
+class ClauseStore(object):
+    """
+    storage clauses by two flat arrays, the clause `i` is `literals[offsets[i]:offsets[i + 1]]`. \n
+    A store is never changed, `mr`, `reduce` and the other operations are vectorized by numpy and return new stores.
+    The functions in `minimal_model.solvers.utils` are the reference of these operations.
+    """
+
+    def __init__(self, literals=None, offsets=None):
+        """
+        :param literals: the literals of all clauses
+        :param offsets: the start of every clause in literals, followed by the count of literals
+        """
+        self.literals = np.asarray(literals if literals is not None else [], dtype=np.int32)
+        self.offsets = np.asarray(offsets if offsets is not None else [0], dtype=np.int64)
+        self.__clause_ids = None
+
+    @staticmethod
+    def from_clauses(clauses):
+        """
+        build a store from a list of clauses
+        """
+        lengths = np.fromiter((len(clause) for clause in clauses), dtype=np.int64)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        literals = np.fromiter(chain.from_iterable(clauses), dtype=np.int32, count=int(offsets[-1]))
+        return ClauseStore(literals, offsets)
+
+    @property
+    def nv(self) -> int:
+        """
+        the max atom of all clauses
+        """
+        return int(np.abs(self.literals).max()) if len(self.literals) else 0
+
+    def clause_ids(self):
+        """
+        :return: the index of the clause every literal belongs to
+        """
+        if self.__clause_ids is None:
+            self.__clause_ids = np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.offsets))
+        return self.__clause_ids
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index) -> List[int]:
+        return self.literals[self.offsets[index]:self.offsets[index + 1]].tolist()
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def to_clauses(self) -> List[List[int]]:
+        return list(self)
+
+    def _atom_mask(self, atoms, size=0):
+        """
+        :return: a bool array, `mask[a]` is True if atom `a` is in atoms
+        """
+        atoms = np.fromiter(atoms, dtype=np.int64) if not isinstance(atoms, np.ndarray) else atoms
+        size = max(size, self.nv) + 1
+        mask = np.zeros(size, dtype=bool)
+        mask[atoms[(atoms > 0) & (atoms < size)]] = True
+        return mask
+
+    def satisfied(self, true) -> bool:
+        """
+        :param true: the true atoms, the others are false
+        :return: whether every clause has a true literal
+        """
+        values = self._atom_mask(true)
+        literal_true = values[np.abs(self.literals)] == (self.literals > 0)
+        return bool(np.all(np.bincount(self.clause_ids()[literal_true], minlength=len(self)) > 0))
+
+    def select(self, keep):
+        """
+        :param keep: a bool array, whether every literal is kept
+        :return: a new store with kept literals, clauses without kept literals are dropped
+        """
+        counts = np.bincount(self.clause_ids()[keep], minlength=len(self))
+        counts = counts[counts > 0]
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return ClauseStore(self.literals[keep], offsets)
+
+    def mr(self, model) -> 'ClauseStore':
+        """
+        minimal reduce algorithm, the same as `minimal_model.solvers.utils.mr`
+        """
+        model = np.asarray(model, dtype=np.int64)
+        false = self._atom_mask(-model[model < 0], len(model))
+        atoms = np.abs(self.literals)
+        false_literal = false[atoms]
+        satisfied = np.zeros(len(self), dtype=bool)
+        satisfied[self.clause_ids()[(self.literals < 0) & false_literal]] = True
+        keep = ~satisfied[self.clause_ids()] & ~((self.literals > 0) & false_literal)
+        return self.select(keep)
+
+    def reduce(self, s) -> 'ClauseStore':
+        """
+        reduce clauses by s, the same as `minimal_model.solvers.utils.reduce` but it doesn't change this store
+        """
+        in_s = self._atom_mask(s)
+        atoms = np.abs(self.literals)
+        satisfied = np.zeros(len(self), dtype=bool)
+        satisfied[self.clause_ids()[(self.literals > 0) & in_s[atoms]]] = True
+        keep = ~satisfied[self.clause_ids()] & ~in_s[atoms]
+        return self.select(keep)
+
+    def compute_ts(self, weights, formula_nv) -> dict:
+        """
+        the same as `minimal_model.solvers.utils.compute_ts`
+        """
+        in_weights = self._atom_mask(weights)
+        outside = np.bincount(self.clause_ids()[~in_weights[np.abs(self.literals)]], minlength=len(self))
+        selected = np.flatnonzero((outside == 0) & (np.diff(self.offsets) > 0))
+        return {formula_nv + int(i): self[i] for i in selected}
+
+    def component_labels(self) -> np.ndarray:
+        """
+        label variable-disjoint components, every clause hooks the labels of its atoms to its smallest label and the
+        labels are shortcut until no label changes
+        :return: the label of every atom from 0 to nv, the atoms of a component have the same label
+        """
+        atoms = np.abs(self.literals).astype(np.int64)
+        lengths = np.diff(self.offsets)
+        starts = self.offsets[:-1][lengths > 0]
+        lengths = lengths[lengths > 0]
+        label = np.arange(self.nv + 1, dtype=np.int64)
+        while len(atoms):
+            previous = label.copy()
+            lowest = np.repeat(np.minimum.reduceat(label[atoms], starts), lengths)
+            np.minimum.at(label, label[atoms], lowest)
+            np.minimum.at(label, atoms, lowest)
+            jumped = label[label]
+            while not np.array_equal(jumped, label):
+                (label, jumped) = (jumped, jumped[jumped])
+            if np.array_equal(label, previous):
+                break
+        return label
+
+    def create_graph(self, formula_nv) -> CompactGraph:
+        """
+        create dependency graph like `minimal_model.solvers.utils.create_graph`, but store it in arrays
+        """
+        size = formula_nv + 1 + len(self)
+        keys = self.clause_ids() + formula_nv + 1
+        literals = self.literals.astype(np.int64)
+        positive = literals > 0
+        starts = np.where(positive, keys, -literals)
+        ends = np.where(positive, literals, keys)
+        offsets = np.zeros(size + 1, dtype=np.int32)
+        np.cumsum(np.bincount(starts, minlength=size), out=offsets[1:])
+        targets = ends[np.argsort(starts, kind='stable')].astype(np.int32)
+        present = np.zeros(size, dtype=np.uint8)
+        present[formula_nv + 1:] = 1
+        present[np.abs(literals)] = 1
+        return CompactGraph(array('i', offsets.tobytes()), array('i', targets.tobytes()), bytearray(present.tobytes()))
+
+
+class ClauseBuffer(object):
+    """
+    a formula which clauses are appended to, stored like `ClauseStore` by a flat `array('i')` of literals and an
+    `array('q')` of offsets, so a literal takes 4 bytes instead of a python int in a python list. \n
+    With `path`, the literals are written to that file and read back by mmap, then they are kept by the page cache
+    instead of the heap of the process. It has `clauses` and `nv` like pysat's `CNF`, and it gives clauses as lists.
+    """
+
+    def __init__(self, from_clauses=None, path=None):
+        """
+        :param from_clauses: clauses appended first, a `ClauseStore` or another buffer is copied without lists
+        :param path: the file which stores the literals, it is overwritten and isn't removed by `close`
+        """
+        self.path = path
+        # the literals which aren't written to the file yet if there is a file
+        self._literals = array('i')
+        self._offsets = array('q', [0])
+        self._nv = 0
+        # the count of literals which `_nv` was computed from
+        self._nv_count = 0
+        self._file = open(path, 'w+b') if path is not None else None
+        self._view = None
+        if from_clauses is not None:
+            self.extend(from_clauses)
+
+    @property
+    def nv(self) -> int:
+        """
+        the max atom of all clauses
+        """
+        count = self._offsets[-1]
+        if self._nv_count < count:
+            literals = self._all_literals()[self._nv_count:count]
+            self._nv = max(self._nv, max(literals), -min(literals))
+            self._nv_count = count
+        return self._nv
+
+    @property
+    def clauses(self) -> 'ClauseBuffer':
+        """
+        the buffer itself, it can be indexed, sliced and iterated like the list of clauses of a `CNF`
+        """
+        return self
+
+    def append(self, clause):
+        self._literals.extend(clause)
+        self._offsets.append(self._offsets[-1] + len(clause))
+        if self._file is not None and len(self._literals) >= FLUSH_SIZE:
+            self._flush()
+
+    def extend(self, clauses):
+        """
+        append clauses, a `ClauseStore` or another buffer is copied by its arrays
+        """
+        if isinstance(clauses, ClauseBuffer):
+            clauses = clauses.store()
+        if not isinstance(clauses, ClauseStore):
+            for clause in getattr(clauses, 'clauses', clauses):
+                self.append(clause)
+            return
+        self._literals.frombytes(clauses.literals.astype(np.int32).tobytes())
+        self._offsets.frombytes((clauses.offsets[1:] + self._offsets[-1]).astype(np.int64).tobytes())
+        if self._file is not None:
+            self._flush()
+
+    def _flush(self):
+        self._file.seek(0, 2)
+        self._literals.tofile(self._file)
+        self._file.flush()
+        del self._literals[:]
+
+    def _all_literals(self):
+        """
+        :return: the literals of all clauses, the array or a memoryview of the mapped file
+        """
+        if self._file is None:
+            return self._literals
+        if self._literals:
+            self._flush()
+        count = self._offsets[-1]
+        if count == 0:
+            return self._literals
+        if self._view is None or len(self._view) != count:
+            # a map doesn't grow with its file, a new one is made and the old one is freed with its last view
+            self._view = memoryview(mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)).cast('i')
+        return self._view
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        """
+        :return: a clause as a list, or a list of clauses if index is a slice
+        """
+        if isinstance(index, slice):
+            (start, stop, step) = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return list(self._iter(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('clause index out of range')
+        return self._all_literals()[self._offsets[index]:self._offsets[index + 1]].tolist()
+
+    def _iter(self, start, stop):
+        literals = self._all_literals()
+        offsets = self._offsets
+        return (literals[begin:end].tolist() for (begin, end) in zip(offsets[start:stop], offsets[start + 1:stop + 1]))
+
+    def __iter__(self):
+        return self._iter(0, len(self))
+
+    def store(self) -> ClauseStore:
+        """
+        :return: the clauses as a `ClauseStore`, the literals are copied from the array or mapped from the file
+        """
+        literals = self._all_literals()
+        if isinstance(literals, memoryview):
+            literals = np.frombuffer(literals, dtype=np.int32)
+        else:
+            literals = np.array(literals, dtype=np.int32)
+        return ClauseStore(literals, np.array(self._offsets, dtype=np.int64))
+
+    def close(self):
+        """
+        close the file, the buffer can't be used after it if it has a file
+        """
+        if self._file is not None:
+            self._view = None
+            self._file.close()
+
+
+class OccurrenceIndex(object):
+    """
+    index from every atom to the clauses of a store which mention it
+    """
+
+    def __init__(self, store: ClauseStore):
+        atoms = np.abs(store.literals).astype(np.int64)
+        offsets = np.zeros(store.nv + 2, dtype=np.int64)
+        np.cumsum(np.bincount(atoms, minlength=store.nv + 1), out=offsets[1:])
+        self.offsets = array('q', offsets.tobytes())
+        self.clauses = array('q', store.clause_ids()[np.argsort(atoms, kind='stable')].tobytes())
+        self.literals = array('i', store.literals.tobytes())
+        self.clause_offsets = array('q', store.offsets.tobytes())
+
+    def __getitem__(self, atom):
+        """
+        :return: the indexes of clauses which mention the atom
+        """
+        if atom + 1 >= len(self.offsets):
+            return ()
+        return self.clauses[self.offsets[atom]:self.offsets[atom + 1]]
+
+    def clause(self, index):
+        return self.literals[self.clause_offsets[index]:self.clause_offsets[index + 1]]
+
+
+class ClauseReduction(object):
+    """
+    a view of the clauses of an `OccurrenceIndex` without removed clauses and atoms. \n
+    `reduce` works like `ClauseStore.reduce` but only changes this view, and both `reduce` and `compute_ts` only touch
+    the clauses which mention the atoms given to them.
+    """
+
+    def __init__(self, index: OccurrenceIndex, removed_clauses=None, removed_atoms=None):
+        """
+        :param removed_clauses: a bytearray, 1 if the clause is removed
+        :param removed_atoms: a bytearray, 1 if the atom is removed from all clauses
+        """
+        self.index = index
+        self.removed_clauses = removed_clauses if removed_clauses is not None else \
+            bytearray(len(index.clause_offsets) - 1)
+        self.removed_atoms = removed_atoms if removed_atoms is not None else bytearray(len(index.offsets) - 1)
+
+    def clause(self, index) -> List[int]:
+        """
+        :return: the literals of the clause which aren't removed
+        """
+        removed_atoms = self.removed_atoms
+        return [x for x in self.index.clause(index) if not removed_atoms[abs(x)]]
+
+    def __iter__(self):
+        return (self.clause(i) for i in range(len(self.removed_clauses)) if not self.removed_clauses[i])
+
+    def compute_ts(self, weights, formula_nv) -> dict:
+        """
+        the same as `ClauseStore.compute_ts`, the key of a clause is `formula_nv` plus its index in the store
+        """
+        ts = {}
+        visited = set()
+        for atom in weights:
+            for i in self.index[atom]:
+                if i in visited or self.removed_clauses[i]:
+                    continue
+                visited.add(i)
+                clause = self.clause(i)
+                if clause and all(abs(x) in weights for x in clause):
+                    ts[formula_nv + i] = clause
+        return ts
+
+    def reduce(self, s):
+        """
+        reduce clauses by s, the same as `ClauseStore.reduce`
+        """
+        for atom in s:
+            if atom < len(self.removed_atoms):
+                self.removed_atoms[atom] = 1
+        for atom in s:
+            for i in self.index[atom]:
+                if self.removed_clauses[i]:
+                    continue
+                clause = self.index.clause(i)
+                if any(x > 0 and x in s for x in clause) or all(self.removed_atoms[abs(x)] for x in clause):
+                    self.removed_clauses[i] = 1
+
+    def mr(self, false):
+        """
+        reduce clauses by atoms which are false, the same as `ClauseStore.mr`
+        :param false: a set of atoms
+        """
+        for atom in false:
+            if atom < len(self.removed_atoms):
+                self.removed_atoms[atom] = 1
+        for atom in false:
+            for i in self.index[atom]:
+                if self.removed_clauses[i]:
+                    continue
+                clause = self.index.clause(i)
+                if any(x < 0 and -x in false for x in clause) or all(self.removed_atoms[abs(x)] for x in clause):
+                    self.removed_clauses[i] = 1
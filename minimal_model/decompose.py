@@ -0,0 +1,159 @@
+import os
+import threading
+from typing import List, Tuple
+
+import numpy as np
+
+import minimal_model.utils
+from minimal_model.processes import Workers
+
+# formulas with fewer clauses are solved in the calling process, starting processes would cost more than solving
+PARALLEL_MIN_CLAUSES = 10000
+
+
+def components(clauses) -> List[Tuple[List[int], List[List[int]]]]:
+    """
+    split clauses into variable-disjoint components by union-find over the atoms of every clause.
+    The atoms of a component are renumbered from 1, so a component is solved as a small formula
+    :return: a list of (atoms, clauses), the atom x of the component's clauses is atoms[x - 1]
+    """
+    parent = {}
+
+    def find(x):
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            (parent[x], x) = (root, parent[x])
+        return root
+
+    for clause in clauses:
+        first = None
+        for x in clause:
+            atom = abs(x)
+            if atom not in parent:
+                parent[atom] = atom
+            if first is None:
+                first = find(atom)
+                continue
+            root = find(atom)
+            if root != first:
+                parent[root] = first
+    groups = {}
+    for clause in clauses:
+        if clause:
+            groups.setdefault(find(abs(clause[0])), []).append(clause)
+    result = []
+    for group in groups.values():
+        atoms = sorted({abs(x) for clause in group for x in clause})
+        index = {atom: i for (i, atom) in enumerate(atoms, 1)}
+        result.append((atoms, [[index[x] if x > 0 else -index[-x] for x in clause] for clause in group]))
+    return result
+
+
+def store_components(store) -> List[Tuple[List[int], List[List[int]]]]:
+    """
+    split a `minimal_model.clauses.ClauseStore` like `components`, the components are labelled by numpy and the clauses
+    are only copied to lists if there are several components
+    :return: the components, empty if the formula is one component or has an empty clause
+    """
+    lengths = np.diff(store.offsets)
+    if len(store) == 0 or not np.all(lengths > 0):
+        return []
+    label = store.component_labels()
+    atoms = np.abs(store.literals).astype(np.int64)
+    clause_label = label[atoms[store.offsets[:-1]]]
+    if np.all(clause_label == clause_label[0]):
+        return []
+    present = np.zeros(len(label), dtype=bool)
+    present[atoms] = True
+    # the atoms of a component are numbered from 1 in the order of the atoms
+    atom_ids = np.flatnonzero(present)
+    atom_ids = atom_ids[np.argsort(label[atom_ids], kind='stable')]
+    atom_labels = label[atom_ids]
+    first = np.flatnonzero(np.r_[True, atom_labels[1:] != atom_labels[:-1]])
+    rank = np.arange(len(atom_ids)) - np.repeat(first, np.diff(np.r_[first, len(atom_ids)])) + 1
+    index = np.zeros(len(label), dtype=np.int64)
+    index[atom_ids] = rank
+    literals = np.where(store.literals > 0, index[atoms], -index[atoms]).tolist()
+    offsets = store.offsets.tolist()
+    order = np.argsort(clause_label, kind='stable')
+    clause_first = np.flatnonzero(np.r_[True, clause_label[order][1:] != clause_label[order][:-1]])
+    result = []
+    for (k, (begin, end)) in enumerate(zip(clause_first, np.r_[clause_first[1:], len(order)])):
+        atom_end = first[k + 1] if k + 1 < len(first) else len(atom_ids)
+        clauses = [literals[offsets[i]:offsets[i + 1]] for i in order[begin:end].tolist()]
+        result.append((atom_ids[first[k]:atom_end].tolist(), clauses))
+    return result
+
+
+def _chunks(parts, jobs) -> List[List[int]]:
+    """
+    assign the largest component to the lightest chunk first, so chunks have about the same count of clauses
+    """
+    chunks = [[] for _ in range(min(jobs, len(parts)))]
+    weights = [0] * len(chunks)
+    for i in sorted(range(len(parts)), key=lambda k: len(parts[k][1]), reverse=True):
+        lightest = weights.index(min(weights))
+        chunks[lightest].append(i)
+        weights[lightest] += len(parts[i][1])
+    return chunks
+
+
+def _work(connection, solver, parts, chunk):
+    # the lock may be held by another thread of the parent when it forks
+    solver._native_lock = threading.Lock()
+    solver._cancel = None
+    solver._interruptible = False
+    solver.stats.reset()
+    for i in chunk:
+        try:
+            result = solver._solve_component(parts[i][1])
+        except minimal_model.utils.DeadlineReached:
+            connection.send({'deadline': True})
+            return
+        connection.send({'index': i, 'result': result})
+        if not result['sat']:
+            break
+    connection.send({'stats': solver.stats.to_dict()})
+
+
+def solve(solver, parts, jobs=None, cancel=None) -> Tuple[List[dict], List[dict]]:
+    """
+    compute a minimal model of every component by `solver`, the components are solved by `jobs` forked processes at
+    the same time, or one by one in this process if jobs is 1 or the formula is small. Solving stops at the first
+    unsatisfiable component.
+    :param parts: components given by `components`
+    :param jobs: the count of processes, default is the count of CPUs
+    :param cancel: a connection, `minimal_model.utils.SolverInterrupted` is raised as soon as it can be read
+    :return: the result of every solved component, `sat`, `true` (the true atoms of the component), `cpu_time`,
+    `compute_model_count` and `check_model_count`, and the stats of every process
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or sum(len(clauses) for (_, clauses) in parts) < PARALLEL_MIN_CLAUSES:
+        results = []
+        for (_, clauses) in parts:
+            results.append(solver._solve_component(clauses))
+            if not results[-1]['sat']:
+                break
+        return results, []
+    results = {}
+    stats = []
+    with Workers() as workers:
+        for chunk in _chunks(parts, jobs):
+            workers.start(_work, solver, parts, chunk)
+        while workers:
+            for worker in workers.wait(cancel=cancel):
+                data = worker.recv()
+                if 'error' in data:
+                    raise RuntimeError('solving a component failed: {}'.format(data['error']))
+                if 'deadline' in data:
+                    raise minimal_model.utils.DeadlineReached()
+                if 'stats' in data:
+                    stats.append(data['stats'])
+                    workers.finish(worker)
+                    continue
+                results[data['index']] = data['result']
+                if not data['result']['sat']:
+                    return [data['result']], stats
+        return [results[i] for i in range(len(parts))], stats
@@ -0,0 +1,114 @@
+import bz2
+import gzip
+import lzma
+from typing import Iterator, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from minimal_model.clauses import ClauseStore
+
+CHUNK_SIZE = 1 << 20
+
+_MAGICS = ((b'\x1f\x8b', gzip.open), (b'BZh', bz2.open), (b'\xfd7zXZ\x00', lzma.open))
+
+
+def open_file(path):
+    """
+    open a DIMACS file in binary mode, gzip, bz2 and xz files are decompressed on the fly
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(6)
+    for (prefix, opener) in _MAGICS:
+        if magic.startswith(prefix):
+            return opener(path, 'rb')
+    return open(path, 'rb')
+
+
+def _iter_chunks(path, chunk_size) -> Iterator[bytes]:
+    """
+    read a DIMACS file by chunks which end at line ends, comment and problem lines are removed
+    """
+    rest = b''
+    with open_file(path) as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            data = rest + data
+            end = data.rfind(b'\n') + 1
+            if end == 0:
+                rest = data
+                continue
+            (data, rest) = (data[:end], data[end:])
+            (data, finished) = _strip(data)
+            yield data
+            if finished:
+                return
+    if rest:
+        yield _strip(rest)[0]
+
+
+def _strip(data):
+    """
+    remove comment and problem lines from data
+    :return: (data, whether the end of the formula is reached)
+    """
+    if b'c' not in data and b'p' not in data and b'%' not in data:
+        return data, False
+    lines = []
+    for line in data.split(b'\n'):
+        line = line.strip()
+        if not line or line[:1] in (b'c', b'p'):
+            continue
+        if line[:1] == b'%':
+            # SATLIB files end with a line of `%`
+            return b'\n'.join(lines), True
+        lines.append(line)
+    return b'\n'.join(lines), False
+
+
+def iter_clauses(path, chunk_size=CHUNK_SIZE) -> Iterator[List[int]]:
+    """
+    read clauses of a DIMACS file one by one, the file is read by chunks so the formula is never loaded at once.
+    Example:
+    solver.append_formula(iter_clauses("formula.cnf.gz"))
+    """
+    clause = []
+    for data in _iter_chunks(path, chunk_size):
+        for literal in map(int, data.split()):
+            if literal == 0:
+                yield clause
+                clause = []
+            else:
+                clause.append(literal)
+    if clause:
+        yield clause
+
+
+def read_store(path, chunk_size=CHUNK_SIZE) -> 'ClauseStore':
+    """
+    read a DIMACS file to a `ClauseStore`, every chunk is parsed by numpy without creating python lists of clauses
+    """
+    # numpy is slow to import, `iter_clauses` doesn't need it
+    import numpy as np
+    from minimal_model.clauses import ClauseStore
+    literal_parts = []
+    length_parts = []
+    pending = np.zeros(0, dtype=np.int32)
+    for data in _iter_chunks(path, chunk_size):
+        tokens = np.concatenate((pending, np.array(data.split(), dtype=np.int32)))
+        ends = np.flatnonzero(tokens == 0)
+        if len(ends) == 0:
+            pending = tokens
+            continue
+        complete = tokens[:ends[-1] + 1]
+        pending = tokens[ends[-1] + 1:]
+        literal_parts.append(complete[complete != 0])
+        length_parts.append(np.diff(ends, prepend=-1) - 1)
+    if len(pending):
+        literal_parts.append(pending)
+        length_parts.append(np.array([len(pending)]))
+    literals = np.concatenate(literal_parts) if literal_parts else np.zeros(0, dtype=np.int32)
+    lengths = np.concatenate(length_parts) if length_parts else np.zeros(0, dtype=np.int64)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return ClauseStore(literals, offsets)
@@ -1,3 +1,7 @@
+from array import array
+from collections import deque
+
+
 class Graph(object):
     """
     storage graph info by dict
@@ -5,7 +9,9 @@ class Graph(object):
 
     def __init__(self):
         self.__content = {}
+        self.__predecessors = {}
         self.__input_degree = {}
+        self.__ready = deque()
 
     def add_point(self, start, end=None):
         """
@@ -16,11 +22,14 @@ class Graph(object):
         else:
             v = set()
             self.__content[start] = v
-        if end is not None and end != start:
+        if end is not None and end != start and end not in v:
             degree = self.__input_degree.get(end, 0)
             self.__input_degree[end] = degree + 1
-            self.__input_degree.setdefault(start, 0)
+            if start not in self.__input_degree:
+                self.__input_degree[start] = 0
+                self.__ready.append(start)
             self.__content.setdefault(end, set())
+            self.__predecessors.setdefault(end, set()).add(start)
             v.add(end)
 
     def empty_indegree(self):
@@ -40,6 +49,9 @@ class Graph(object):
     def __getitem__(self, index):
         return self.__content[index]
 
+    def __contains__(self, point):
+        return point in self.__content
+
     def __str__(self):
         s = ['Graph:']
         for (k, v) in self.__content.items():
@@ -53,14 +65,15 @@ class Graph(object):
         """
         This method is used to delete a point and update in-degree.
         """
-        indegree = self.__input_degree[point]
         for node in self.__content[point]:
             self.__input_degree[node] -= 1
+            self.__predecessors[node].discard(point)
+            if self.__input_degree[node] == 0:
+                self.__ready.append(node)
+        for node in self.__predecessors.pop(point, ()):
+            self.__content[node].discard(point)
         del self.__content[point]
-        del self.__input_degree[point]
-        if indegree > 0:
-            for (k, v) in self.__content.items():
-                self.__content[k] = {x for x in v if x != point}
+        self.__input_degree.pop(point, None)
 
     def reverse(self):
         """
@@ -79,114 +92,339 @@ class Graph(object):
         '''
         Return a point which in-degree is zero. if there isn't,it will reurn `None`
         '''
-        for (k, v) in self.__input_degree.items():
-            if v == 0:
-                return k
+        ready = self.__ready
+        # points are queued when their in-degree becomes zero, skip the ones removed or given an edge since then
+        while ready and self.__input_degree.get(ready[0]) != 0:
+            ready.popleft()
+        if ready:
+            return ready[0]
+
+
+class CompactGraph(object):
+    """
+    storage graph info by arrays in compressed sparse row layout. \n
+    Points are integers in `[0, size)`, the successors of point `k` are `targets[offsets[k]:offsets[k + 1]]`
+    and `present[k]` is 1 only if `k` is a point of the graph. Removing a point only clears `present`, so the
+    arrays may still hold edges to removed points.
+    """
+
+    def __init__(self, offsets, targets, present):
+        self.offsets = offsets
+        self.targets = targets
+        self.present = present
+        self.__reverse = None
+
+    @property
+    def size(self) -> int:
+        return len(self.present)
+
+    @staticmethod
+    def from_graph(graph: Graph):
+        """
+        build a compact graph from a `Graph` whose points are non-negative integers
+        """
+        size = max(graph, default=-1) + 1
+        present = bytearray(size)
+        offsets = array('i', [0])
+        targets = array('i')
+        for point in range(size):
+            if point in graph:
+                present[point] = 1
+                targets.extend(graph[point])
+            offsets.append(len(targets))
+        return CompactGraph(offsets, targets, present)
 
+    def reverse(self):
+        """
+        reverse this graph and return result,but it don't update itself. The result is cached
+        """
+        if self.__reverse is None:
+            size = len(self.present)
+            offsets = array('i', [0]) * (size + 1)
+            for point in self.targets:
+                offsets[point + 1] += 1
+            for point in range(size):
+                offsets[point + 1] += offsets[point]
+            position = array('i', offsets)
+            targets = array('i', [0]) * len(self.targets)
+            for point in range(size):
+                for i in range(self.offsets[point], self.offsets[point + 1]):
+                    end = self.targets[i]
+                    targets[position[end]] = point
+                    position[end] += 1
+            self.__reverse = CompactGraph(offsets, targets, self.present)
+        return self.__reverse
+
+    def successors(self, point):
+        present = self.present
+        return [x for x in self.targets[self.offsets[point]:self.offsets[point + 1]] if present[x]]
+
+    def remove(self, point):
+        """
+        This method is used to delete a point
+        """
+        self.present[point] = 0
+
+    def __contains__(self, point):
+        return 0 <= point < len(self.present) and self.present[point] == 1
+
+    def __iter__(self):
+        return (k for k in range(len(self.present)) if self.present[k])
 
-class StronglyConnectedGraph:
+    def __str__(self):
+        s = ['Graph:']
+        for k in self:
+            s.append('{}  => {} \n'.format(k, set(self.successors(k))))
+        return '\n'.join(s)
+
+
+class _SccWeights(object):
+    """
+    a read-only view of the points of every strongly connected component which isn't removed, keyed by component
+    """
+
+    def __init__(self, scc):
+        self.__scc = scc
+
+    def __getitem__(self, key):
+        return self.__scc._members(key)
+
+    def __delitem__(self, key):
+        self.__scc.remove(key)
+
+    def __contains__(self, key):
+        return key in self.__scc
+
+    def __iter__(self):
+        return iter(self.__scc)
+
+    def __len__(self):
+        return len(self.__scc)
+
+    def keys(self):
+        return list(self.__scc)
+
+    def items(self):
+        return [(k, self[k]) for k in self.__scc]
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+
+class StronglyConnectedGraph(object):
     '''
-    storage strongly connected graph info by dict
+    storage strongly connected graph info by arrays. \n
+    Components are computed by an iterative Tarjan algorithm, so it doesn't depend on the recursion limit. A component
+    is keyed by its minimal point, `scc_weights[key]` is its points and `graph[key]` is the keys of its successors.
+    `remove` peels components while walking the graph, `reset` restores them, and `delete` removes points from the
+    underlying graph and only splits the components they belonged to.
     '''
 
     def __init__(self, graph):
-        self.graph = graph
-        self.scc_weights = {}
-        self.__content = {}
-        self.__input_degree = {}
+        """
+        :param graph: a `CompactGraph`, or a `Graph` whose points are non-negative integers
+        """
+        self.graph = graph if isinstance(graph, CompactGraph) else CompactGraph.from_graph(graph)
+        self.scc_weights = _SccWeights(self)
         self.compute()
 
     def compute(self):
         """
         This method is used to get strongly connected graph by graph given by constructor,it wll be called in constructor
         """
-        self.scc_weights.clear()
-        self.__content.clear()
-        self.__input_degree.clear()
-        visite_seq = []
-        self.__loop_dfs(visite_seq)
-        reverse = self.graph.reverse()
-        visited = {}
-        weights_map = {}
-        visite_seq.reverse()
-        for node in visite_seq:
-            if visited.get(node):
+        size = self.graph.size
+        self.__index = array('i', [-1]) * size
+        self.__low = array('i', [0]) * size
+        self.__component = array('i', [-1]) * size
+        self.__members = array('i')
+        self.__member_offsets = array('i', [0])
+        self.__keys = array('i')
+        self.__retired = bytearray()
+        self.__base_degree = array('i')
+        self.__tarjan(range(size), self.graph.present)
+        self.__count_input_degree(range(len(self.__keys)))
+        self.reset()
+        return self
+
+    def reset(self):
+        """
+        This method is used to restore all components removed by `remove`
+        """
+        self.__input_degree = array('i', self.__base_degree)
+        self.__removed = bytearray(self.__retired)
+        removed = self.__removed
+        self.__ready = deque(c for (c, degree) in enumerate(self.__input_degree) if degree == 0 and not removed[c])
+
+    def delete(self, points):
+        """
+        This method is used to delete points from the underlying graph. Only the components which contain the points
+        are computed again, and all components removed by `remove` are restored.
+        """
+        present = self.graph.present
+        component = self.__component
+        affected = set()
+        for point in points:
+            if point not in self.graph:
                 continue
-            seq = []
-            self.__dfs(reverse, visited, node, seq)
-            key = min(seq)
-            self.scc_weights[key] = seq
-            weights_map.update({x: key for x in seq})
-        for (key, value) in self.graph.items():
-            if len(value) == 0:
-                self.add_point(weights_map[key])
+            self.graph.remove(point)
+            c = component[point]
+            affected.add(c)
+            for end in self.graph.successors(point):
+                d = component[end]
+                if d != c:
+                    self.__base_degree[d] -= 1
+        region = bytearray(self.graph.size)
+        for c in affected:
+            self.__retired[c] = 1
+            members = [x for x in self.__component_members(c) if present[x]]
+            for point in members:
+                region[point] = 1
+                self.__index[point] = -1
+                component[point] = -1
+            first = len(self.__keys)
+            self.__tarjan(members, region)
+            for point in members:
+                region[point] = 0
+            self.__count_input_degree(range(first, len(self.__keys)))
+        self.reset()
+
+    def __tarjan(self, roots, region):
+        """
+        assign a new component to every point in `region` reachable from roots, only walking edges inside `region`
+        """
+        graph_offsets = self.graph.offsets
+        graph_targets = self.graph.targets
+        index = self.__index
+        low = self.__low
+        component = self.__component
+        members = self.__members
+        member_offsets = self.__member_offsets
+        stack = array('i')
+        call = array('i')
+        edge = array('i')
+        counter = 0
+        for root in roots:
+            if not region[root] or index[root] != -1:
                 continue
-            for v in value:
-                self.add_point(weights_map[key], weights_map[v])
-        return self
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            call.append(root)
+            edge.append(graph_offsets[root])
+            while call:
+                v = call[-1]
+                i = edge[-1]
+                if i < graph_offsets[v + 1]:
+                    edge[-1] = i + 1
+                    w = graph_targets[i]
+                    if not region[w]:
+                        continue
+                    if index[w] == -1:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        call.append(w)
+                        edge.append(graph_offsets[w])
+                    elif component[w] == -1 and index[w] < low[v]:
+                        # w is visited but not assigned, so it is still on the stack
+                        low[v] = index[w]
+                    continue
+                call.pop()
+                edge.pop()
+                if call and low[v] < low[call[-1]]:
+                    low[call[-1]] = low[v]
+                if low[v] == index[v]:
+                    c = len(self.__keys)
+                    start = len(members)
+                    while True:
+                        w = stack.pop()
+                        component[w] = c
+                        members.append(w)
+                        if w == v:
+                            break
+                    member_offsets.append(len(members))
+                    self.__keys.append(min(members[start:]))
+                    self.__retired.append(0)
+                    self.__base_degree.append(0)
+
+    def __count_input_degree(self, components):
+        """
+        count the edges coming into components from other components, an edge is counted once for every pair of points
+        """
+        present = self.graph.present
+        component = self.__component
+        reverse = self.graph.reverse()
+        for c in components:
+            degree = 0
+            for point in self.__component_members(c):
+                for i in range(reverse.offsets[point], reverse.offsets[point + 1]):
+                    start = reverse.targets[i]
+                    if present[start] and component[start] != c:
+                        degree += 1
+            self.__base_degree[c] = degree
+
+    def __component_members(self, c):
+        return self.__members[self.__member_offsets[c]:self.__member_offsets[c + 1]]
+
+    def __successors(self, c):
+        present = self.graph.present
+        component = self.__component
+        graph_offsets = self.graph.offsets
+        graph_targets = self.graph.targets
+        for point in self.__component_members(c):
+            for i in range(graph_offsets[point], graph_offsets[point + 1]):
+                end = graph_targets[i]
+                if present[end] and component[end] != c:
+                    yield component[end]
+
+    def __find(self, point):
+        if point not in self.graph:
+            raise KeyError(point)
+        c = self.__component[point]
+        if self.__removed[c] or self.__keys[c] != point:
+            raise KeyError(point)
+        return c
+
+    def _members(self, point):
+        return list(self.__component_members(self.__find(point)))
 
     def remove(self, point):
         '''
         This method is used to delete a point and update in-degree.
         '''
-        indegree = self.__input_degree[point]
-        for node in self.__content.get(point, []):
-            self.__input_degree[node] -= 1
-        del self.__content[point]
-        del self.__input_degree[point]
-        if indegree > 0:
-            for (k, v) in self.__content.items():
-                self.__content[k] = {x for x in v if x != point}
-        del self.scc_weights[point]
-
-    def __dfs(self, graph, visited, node, visite_seq):
-        visited[node] = True
-        ls = graph.get(node, [])
-        for item in ls:
-            if visited.get(item):
-                continue
-            self.__dfs(graph, visited, item, visite_seq)
-        visite_seq.append(node)
-
-    def __getattr__(self, name):
-        return getattr(self.__content, name)
+        c = self.__find(point)
+        self.__removed[c] = 1
+        input_degree = self.__input_degree
+        for d in self.__successors(c):
+            input_degree[d] -= 1
+            if input_degree[d] == 0:
+                self.__ready.append(d)
 
     def __getitem__(self, index):
-        return self.__content[index]
+        c = self.__find(index)
+        return {self.__keys[d] for d in self.__successors(c) if not self.__removed[d]}
+
+    def __contains__(self, point):
+        try:
+            self.__find(point)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self):
+        return self.__removed.count(0)
 
     def __str__(self):
         s = ['Graph:']
-        for (k, v) in self.__content.items():
-            s.append('{}  => {} \n'.format(k, v))
+        for k in self:
+            s.append('{}  => {} \n'.format(k, self[k]))
         return '\n'.join(s)
 
     def __iter__(self):
-        return self.__content.__iter__()
+        return (self.__keys[c] for c in range(len(self.__removed)) if not self.__removed[c])
 
-    def __loop_dfs(self, visite_seq):
-        visited = {}
-        for key in self.graph:
-            if not visited.get(key):
-                self.__dfs(self.graph, visited, key, visite_seq)
-
-    def add_point(self, start, end=None):
-        '''
-        add a point to graph
-        '''
-        if start in self.__content:
-            v = self.__content[start]
-        else:
-            v = set()
-            self.__content[start] = v
-        if end is None or end == start:
-            return
-        if end in v:
-            return
-        degree = self.__input_degree.get(end, 0)
-        self.__input_degree[end] = degree + 1
-        self.__input_degree.setdefault(start, 0)
-        self.__content.setdefault(end, set())
-        v.add(end)
+    def items(self):
+        return [(k, self[k]) for k in self]
 
     def empty_indegree(self):
         '''
@@ -197,12 +435,15 @@ class StronglyConnectedGraph:
             pass
         ```
         '''
-        return [k for (k, v) in self.__input_degree.items() if v == 0]
+        return [self.__keys[c] for c in range(len(self.__removed))
+                if not self.__removed[c] and self.__input_degree[c] == 0]
 
     def get_one_empty_indegree(self):
         '''
         Return a point which in-degree is zero. if there isn't,it will reurn `None`
         '''
-        for (k, v) in self.__input_degree.items():
-            if v == 0:
-                return k
+        ready = self.__ready
+        while ready and self.__removed[ready[0]]:
+            ready.popleft()
+        if ready:
+            return self.__keys[ready[0]]
@@ -0,0 +1,166 @@
+import os
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pysat.solvers
+
+from minimal_model.clauses import ClauseBuffer, ClauseStore
+from minimal_model.processes import Workers
+from minimal_model.stats import Stats
+
+# batches with fewer models are checked in the calling process, starting processes would cost more than checking
+PARALLEL_MIN_MODELS = 64
+
+
+class MinimalityChecker(object):
+    """
+    check whether models are minimal models of one formula. The clause store, the index from literals to clauses and
+    the pysat solver are built once and reused by every check. A model with a true atom which is the only true literal
+    of no clause isn't minimal, the atom can be set false alone, only other models are given to the pysat solver.
+    Example:
+    checker = MinimalityChecker(clauses)
+    checker.is_minimal([1, -2, 3])
+    results = checker.check_models(models, jobs=4)
+    """
+
+    def __init__(self, clauses, pysat_name='m22'):
+        """
+        :param clauses: a `ClauseStore`, a `ClauseBuffer`, a CNF formula or an iterable of clauses
+        :param pysat_name: the name of the pysat solver searching smaller models
+        """
+        if isinstance(clauses, ClauseBuffer):
+            clauses = clauses.store()
+        elif not isinstance(clauses, ClauseStore):
+            clauses = ClauseBuffer(clauses).store()
+        self._store = clauses
+        self._nv = clauses.nv
+        # a literal repeated in a clause is kept once, otherwise it would be counted as two true literals
+        shift = 2 * self._nv + 1
+        keys = np.unique(clauses.clause_ids() * shift + (clauses.literals.astype(np.int64) + self._nv))
+        literals = keys % shift - self._nv
+        self._atoms = np.abs(literals)
+        self._positive = literals > 0
+        self._clause_ids = keys // shift
+        self._pysat_name = pysat_name
+        self._solver = None
+        # selector literals are allocated above the atoms of the formula
+        self._top = self._nv
+        self.stats = Stats()
+
+    @property
+    def nv(self) -> int:
+        return self._nv
+
+    def is_minimal(self, model) -> bool:
+        """
+        :param model: a list of literals, the atoms which aren't positive in it are false
+        :return: whether model is a minimal model of the formula
+        """
+        return self.check(model)['minimal']
+
+    def check(self, model) -> dict:
+        """
+        check a model, neither the model nor the formula is changed
+        :param model: a list of literals, the atoms which aren't positive in it are false
+        :return: `satisfied` (whether model satisfies the formula), `minimal` and `smaller`, the sorted true atoms of a
+        model of the formula which are a proper subset of the true atoms of model, it proves model isn't minimal. It is
+        None if model is minimal or doesn't satisfy the formula
+        """
+        true = sorted({x for x in model if x > 0})
+        (values, literal_true, counts) = self._count_true(true)
+        if not np.all(counts > 0):
+            return {'satisfied': False, 'minimal': False, 'smaller': None}
+        sole = literal_true & self._positive & (counts[self._clause_ids] == 1)
+        supported = np.zeros(len(values), dtype=bool)
+        supported[self._atoms[sole]] = True
+        free = np.flatnonzero(values & ~supported)
+        if len(free):
+            atom = int(free[0])
+            smaller = [x for x in true if x != atom]
+            if self._satisfied(smaller):
+                return {'satisfied': True, 'minimal': False, 'smaller': smaller}
+        smaller = self._solve_smaller(true)
+        if smaller is not None and not self._satisfied(smaller):
+            raise RuntimeError('the smaller model given by pysat doesn\'t satisfy the formula')
+        return {'satisfied': True, 'minimal': smaller is None, 'smaller': smaller}
+
+    def _count_true(self, true):
+        """
+        :param true: the sorted true atoms
+        :return: the value of every atom, whether every literal is true and the count of true literals of every clause
+        """
+        values = np.zeros(max(self._nv, true[-1] if true else 0) + 1, dtype=bool)
+        values[true] = True
+        literal_true = values[self._atoms] == self._positive
+        return values, literal_true, np.bincount(self._clause_ids[literal_true], minlength=len(self._store))
+
+    def _satisfied(self, true) -> bool:
+        """
+        whether the model with the sorted true atoms satisfies the formula
+        """
+        return bool(np.all(self._count_true(true)[2] > 0))
+
+    def _solve_smaller(self, true) -> Optional[List[int]]:
+        """
+        search a model whose true atoms are a proper subset of true by the kept pysat solver, the clause asking for it
+        is guarded by a selector literal and retired afterwards
+        :return: the sorted true atoms of the model found, None if there isn't one
+        """
+        if not true:
+            return None
+        if self._solver is None:
+            self._solver = pysat.solvers.Solver(self._pysat_name, bootstrap_with=self._store)
+            self.stats.count('clauses_added', len(self._store))
+        self._top += 1
+        selector = self._top
+        in_true = set(true)
+        self._solver.add_clause([-selector] + [-x for x in true])
+        assumptions = [selector] + [-x for x in range(1, self._nv + 1) if x not in in_true]
+        with self.stats.phase('sat'):
+            self.stats.count('sat_calls')
+            found = self._solver.solve(assumptions=assumptions)
+        smaller = sorted(x for x in self._solver.get_model()[:self._nv] if x > 0) if found else None
+        self._solver.add_clause([-selector])
+        self.stats.count('clauses_added', 2)
+        return smaller
+
+    def check_models(self, models: Iterable, jobs=None) -> List[dict]:
+        """
+        check many models by `check`, a large batch is split among `jobs` forked processes, which share the structures
+        of the formula built by this checker and create their own pysat solvers
+        :param jobs: the count of processes, default is the count of CPUs
+        :return: the result of every model in the same order
+        """
+        models = list(models)
+        jobs = min(jobs or os.cpu_count() or 1, len(models))
+        if jobs <= 1 or len(models) < PARALLEL_MIN_MODELS:
+            return [self.check(model) for model in models]
+        results = [None] * len(models)
+        with Workers() as workers:
+            for k in range(jobs):
+                workers.start(_work, self, models, k, jobs, tag=k)
+            while workers:
+                for worker in workers.wait():
+                    data = worker.recv()
+                    if 'error' in data:
+                        raise RuntimeError('checking models failed: {}'.format(data['error']))
+                    results[worker.tag::jobs] = data['results']
+                    self.stats.merge(data['stats'])
+                    workers.finish(worker)
+        return results
+
+    def delete(self):
+        """
+        delete the pysat solver, it is created again by the next check which needs it
+        """
+        if self._solver is not None:
+            self._solver.delete()
+            self._solver = None
+
+
+def _work(connection, checker: MinimalityChecker, models, start, step):
+    # the native solver of the parent isn't shared with a forked process
+    checker._solver = None
+    checker.stats = Stats()
+    results = [checker.check(model) for model in models[start::step]]
+    connection.send({'results': results, 'stats': checker.stats.to_dict()})
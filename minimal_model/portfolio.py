@@ -0,0 +1,83 @@
+import time
+from typing import List, Tuple
+
+import minimal_model.utils
+from minimal_model.processes import Workers, worker_options
+
+DEFAULT_CONFIGURATIONS = (('MM', False, 'm22'), ('MR', False, 'm22'), ('MM', True, 'g4'), ('MR', True, 'cd'))
+
+
+def parse_configurations(spec: str) -> List[Tuple[str, bool, str]]:
+    """
+    parse configurations like `MM:m22,MR+mr:g4`, every configuration is an algorithm's name, an optional `+mr` to
+    apply mr to every computing step, and an optional pysat solver's name which is `m22` by default
+    :return: a list of (name, mr, pysat_name)
+    """
+    configurations = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        (name, _, pysat_name) = item.partition(':')
+        (name, _, flag) = name.partition('+')
+        if flag not in ('', 'mr'):
+            raise ValueError('unknown flag [{}] in configuration [{}]'.format(flag, item))
+        configurations.append((name, flag == 'mr', pysat_name or 'm22'))
+    return configurations
+
+
+def format_configuration(configuration) -> str:
+    (name, mr, pysat_name) = configuration
+    return '{}{}:{}'.format(name, '+mr' if mr else '', pysat_name)
+
+
+def _work(connection, clauses, configuration, options):
+    from minimal_model.solvers import Solver
+    (name, mr, pysat_name) = configuration
+    solver = Solver(name, mr=mr, pysat_name=pysat_name, **worker_options(options))
+    solver.append_formula(clauses)
+    try:
+        (sat, model) = solver.compute_minimal_model()
+    except minimal_model.utils.DeadlineReached:
+        connection.send({'error': 'no model before the deadline', 'deadline': True})
+        return
+    connection.send({'sat': sat, 'model': model, 'proven_minimal': solver.proven_minimal,
+                     'cpu_time': solver.cpu_time, 'compute_model_count': solver.compute_model_count,
+                     'check_model_count': solver.check_model_count, 'stats': solver.stats.to_dict()})
+
+
+def race(clauses, configurations=DEFAULT_CONFIGURATIONS, timeout=None, cancel=None, options=None) -> dict:
+    """
+    compute a minimal model of clauses by every configuration in a separate process at the same time, the first
+    result is returned and the other processes are killed
+    :param configurations: a list of (name, mr, pysat_name)
+    :param timeout: wall clock seconds to wait for all configurations, None is unlimited
+    :param cancel: a connection, `minimal_model.utils.SolverInterrupted` is raised as soon as it can be read
+    :param options: other parameters of every solver, such as `deadline` and `memory_watermark`
+    :return: the result of the winner, `configuration` is the winner and `sat`, `model`, `proven_minimal`,
+    `cpu_time`, `compute_model_count`, `check_model_count` and `stats` are its result. If every configuration
+    reaches the deadline before it finds a model, `minimal_model.utils.DeadlineReached` is raised
+    """
+    errors = []
+    deadlines = 0
+    # configurations which fail don't give the others more time
+    stop_time = time.monotonic() + timeout if timeout is not None else None
+    # forked processes start with the solvers already imported, the default method isn't fork in server workers
+    with Workers() as workers:
+        for configuration in configurations:
+            workers.start(_work, clauses, tuple(configuration), options or {}, tag=tuple(configuration))
+        while workers:
+            ready = workers.wait(max(0.0, stop_time - time.monotonic()) if stop_time is not None else None, cancel)
+            if not ready:
+                raise TimeoutError('no configuration finished in {} seconds'.format(timeout))
+            for worker in ready:
+                result = worker.recv()
+                workers.finish(worker)
+                if 'error' not in result:
+                    result['configuration'] = worker.tag
+                    return result
+                errors.append('{} {}'.format(format_configuration(worker.tag), result['error']))
+                deadlines += bool(result.get('deadline'))
+        if errors and deadlines == len(errors):
+            raise minimal_model.utils.DeadlineReached()
+        raise RuntimeError('every configuration failed: {}'.format('; '.join(errors)))
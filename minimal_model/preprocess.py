@@ -0,0 +1,197 @@
+from collections import deque
+from typing import List, Optional, Set
+
+
+class Preprocessed(object):
+    """
+    the result of `preprocess`. \n
+    A minimal model of the original formula is `true` plus a minimal model of `clauses`, every other atom is false.
+    """
+
+    def __init__(self, sat, clauses, true):
+        """
+        :param sat: False if the formula is unsatisfiable
+        :param clauses: the residual clauses
+        :param true: the atoms true in every model
+        """
+        self.sat = sat
+        self.clauses = clauses
+        self.true = true
+
+    @property
+    def horn(self) -> bool:
+        """
+        whether every residual clause has one positive literal at most
+        """
+        return is_horn(self.clauses)
+
+
+def is_horn(clauses) -> bool:
+    """
+    whether every clause has one positive literal at most
+    """
+    return all(sum(1 for x in clause if x > 0) <= 1 for clause in clauses)
+
+
+def horn_minimal_model(clauses) -> Optional[Set[int]]:
+    """
+    compute the unique minimal model of Horn clauses by forward chaining in linear time
+    :return: the true atoms, None if the clauses are unsatisfiable
+    """
+    waiting = []
+    heads = []
+    watches = {}
+    queue = deque()
+    true = set()
+    for (i, clause) in enumerate(clauses):
+        head = 0
+        body = 0
+        for x in clause:
+            if x > 0:
+                head = x
+            else:
+                body += 1
+                watches.setdefault(-x, []).append(i)
+        waiting.append(body)
+        heads.append(head)
+        if body == 0:
+            if head == 0:
+                return None
+            queue.append(head)
+    while queue:
+        atom = queue.popleft()
+        if atom in true:
+            continue
+        true.add(atom)
+        for i in watches.get(atom, ()):
+            waiting[i] -= 1
+            if waiting[i] == 0:
+                if heads[i] == 0:
+                    return None
+                queue.append(heads[i])
+    return true
+
+
+def preprocess(clauses, subsume=True) -> Preprocessed:
+    """
+    simplify clauses without changing their minimal models: tautologies are removed, unit clauses are propagated,
+    atoms which never appear positively are set false, and clauses subsumed by others are removed
+    """
+    clauses = [list(set(clause)) for clause in clauses]
+    clauses = [clause for clause in clauses if not any(-x in clause for x in clause if x > 0)]
+    alive = bytearray(b'\x01') * len(clauses)
+    occurrences = {}
+    for (i, clause) in enumerate(clauses):
+        for x in clause:
+            occurrences.setdefault(x, []).append(i)
+    value = {}
+    if not _propagate(clauses, alive, occurrences, value):
+        return Preprocessed(False, [], set())
+    _remove_pure(clauses, alive, occurrences, value)
+    if subsume and _subsume(clauses, alive, value):
+        _remove_pure(clauses, alive, occurrences, value)
+    residual = []
+    for (i, clause) in enumerate(clauses):
+        if alive[i]:
+            residual.append([x for x in clause if abs(x) not in value])
+    return Preprocessed(True, residual, {x for (x, v) in value.items() if v})
+
+
+def _propagate(clauses, alive, occurrences, value) -> bool:
+    """
+    propagate unit clauses, satisfied clauses are marked dead
+    :return: False if a clause is falsified
+    """
+    size = [len(clause) for clause in clauses]
+    queue = deque(clause[0] for clause in clauses if len(clause) == 1)
+    if any(len(clause) == 0 for clause in clauses):
+        return False
+    while queue:
+        literal = queue.popleft()
+        atom = abs(literal)
+        if atom in value:
+            if value[atom] != (literal > 0):
+                return False
+            continue
+        value[atom] = literal > 0
+        for i in occurrences.get(literal, ()):
+            alive[i] = 0
+        for i in occurrences.get(-literal, ()):
+            if not alive[i]:
+                continue
+            size[i] -= 1
+            if size[i] == 0:
+                return False
+            if size[i] == 1:
+                unit = next(x for x in clauses[i] if abs(x) not in value)
+                queue.append(unit)
+    return True
+
+
+def _remove_pure(clauses, alive, occurrences, value):
+    """
+    set false the atoms which never appear positively in alive clauses, a minimal model never sets them true
+    """
+    positive = {}
+    atoms = set()
+    for (i, clause) in enumerate(clauses):
+        if not alive[i]:
+            continue
+        for x in clause:
+            if abs(x) in value:
+                continue
+            atoms.add(abs(x))
+            if x > 0:
+                positive[x] = positive.get(x, 0) + 1
+    queue = deque(x for x in atoms if x not in positive)
+    while queue:
+        atom = queue.popleft()
+        if atom in value:
+            continue
+        value[atom] = False
+        for i in occurrences.get(-atom, ()):
+            if not alive[i]:
+                continue
+            alive[i] = 0
+            for x in clauses[i]:
+                if x > 0 and x not in value:
+                    positive[x] -= 1
+                    if positive[x] == 0:
+                        queue.append(x)
+
+
+def _subsume(clauses, alive, value) -> bool:
+    """
+    mark dead the clauses which are supersets of other alive clauses
+    :return: whether a clause is removed
+    """
+    reduced = {}
+    index = {}
+    for (i, clause) in enumerate(clauses):
+        if alive[i]:
+            reduced[i] = frozenset(x for x in clause if abs(x) not in value)
+            for x in reduced[i]:
+                index.setdefault(x, []).append(i)
+    removed = False
+    for i in sorted(reduced, key=lambda k: len(reduced[k])):
+        if not alive[i]:
+            continue
+        clause = reduced[i]
+        if not clause:
+            continue
+        candidates = min((index[x] for x in clause), key=len)
+        for j in candidates:
+            if j != i and alive[j] and len(reduced[j]) >= len(clause) and clause <= reduced[j]:
+                # equal clauses remove the later one only
+                if len(reduced[j]) == len(clause) and j < i:
+                    continue
+                alive[j] = 0
+                removed = True
+    return removed
+
+
+def expand_model(true, nv) -> List[int]:
+    """
+    :return: the model of atoms from 1 to nv, only the atoms in true are positive
+    """
+    return [x if x in true else -x for x in range(1, nv + 1)]
@@ -0,0 +1,162 @@
+import os
+import signal
+from typing import List
+
+from minimal_model.utils import SolverInterrupted
+
+# multiprocessing is imported by the functions which use it, so importing this module doesn't slow down the cli
+
+
+def get_context(method='fork'):
+    """
+    :param method: the start method, it is replaced by the default method if the platform doesn't have it. Forked
+    processes start with the modules and the data of the parent
+    """
+    import multiprocessing
+    return multiprocessing.get_context(method if method in multiprocessing.get_all_start_methods() else None)
+
+
+def worker_options(options) -> dict:
+    """
+    the options of a solver run by a worker. Workers already solve at the same time, so the components of a formula
+    are solved one by one unless `jobs` is given
+    """
+    return dict({'jobs': 1}, **options)
+
+
+def _run(target, connection, args, group):
+    if group:
+        # a new process group, so processes started by the target are killed with it
+        os.setpgrp()
+    try:
+        target(connection, *args)
+    except Exception as e:
+        connection.send({'error': '{}: {}'.format(type(e).__name__, e)})
+    finally:
+        connection.close()
+
+
+class Worker(object):
+    """
+    a process which runs `target(connection, *args)`, the target sends its results by connection. If it raises, an
+    `error` record is sent for it
+    """
+
+    def __init__(self, context, target, args=(), group=False, duplex=False, tag=None):
+        """
+        :param group: run the process in its own process group, then it can start processes and they are killed with
+        it. Otherwise the process is a daemon
+        :param duplex: whether the target can also receive by connection
+        :param tag: any data of the caller
+        """
+        self.tag = tag
+        self.group = group
+        (self.connection, writer) = context.Pipe(duplex=duplex)
+        self.process = context.Process(target=_run, args=(target, writer, args, group), daemon=not group)
+        self.process.start()
+        writer.close()
+
+    def recv(self):
+        """
+        :return: the next message, `{'error': 'exit code N'}` if the process exited without sending one
+        """
+        try:
+            return self.connection.recv()
+        except EOFError:
+            self.process.join()
+            return {'error': 'exit code {}'.format(self.process.exitcode)}
+
+    def join(self):
+        """
+        wait for the process after its last message
+        """
+        self.connection.close()
+        self.process.join()
+
+    def kill(self):
+        if self.group:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                # the process hasn't created its process group yet
+                self.process.kill()
+        else:
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+def wait(items, timeout=None, cancel=None) -> list:
+    """
+    wait until any of items can be read
+    :param items: `Worker`s or connections
+    :param timeout: seconds, None is unlimited
+    :param cancel: a connection, `minimal_model.utils.SolverInterrupted` is raised as soon as it can be read
+    :return: the items which can be read, empty if the timeout is reached
+    """
+    import multiprocessing.connection
+    connections = {getattr(item, 'connection', item): item for item in items}
+    ready = multiprocessing.connection.wait(list(connections) + ([cancel] if cancel is not None else []), timeout)
+    if cancel is not None and cancel in ready:
+        raise SolverInterrupted()
+    return [connections[connection] for connection in ready]
+
+
+class Workers(object):
+    """
+    the workers started by a caller, the workers which are still running when it exits as a context manager are
+    killed.
+    Example:
+    with Workers() as workers:
+        for part in parts:
+            workers.start(_work, part, tag=part)
+        while workers:
+            for worker in workers.wait():
+                result = worker.recv()
+                workers.finish(worker)
+    """
+
+    def __init__(self, method='fork', group=False):
+        """
+        :param method: the start method, see `get_context`. None is the default method
+        :param group: see `Worker`
+        """
+        self.context = get_context(method)
+        self.group = group
+        self._running = []
+
+    def start(self, target, *args, tag=None) -> Worker:
+        worker = Worker(self.context, target, args, self.group, tag=tag)
+        self._running.append(worker)
+        return worker
+
+    def wait(self, timeout=None, cancel=None) -> List[Worker]:
+        """
+        see `wait`
+        """
+        return wait(self._running, timeout, cancel)
+
+    def finish(self, worker):
+        """
+        wait for a worker after its last message
+        """
+        self._running.remove(worker)
+        worker.join()
+
+    def kill(self, worker):
+        self._running.remove(worker)
+        worker.kill()
+
+    def __len__(self):
+        return len(self._running)
+
+    def __iter__(self):
+        return iter(list(self._running))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        for worker in self._running:
+            worker.kill()
+        self._running = []
@@ -0,0 +1,264 @@
+import json
+import multiprocessing
+import os
+import resource
+import socketserver
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Iterable
+
+from minimal_model.processes import Worker, get_context, wait, worker_options
+
+# imported by the fork server once, so new workers start with them loaded
+PRELOAD = ['pysat.solvers', 'minimal_model.solvers.solvers', 'minimal_model.solvers.mr_solvers',
+           'minimal_model.dimacs', 'minimal_model.batch']
+
+SOLVER_OPTIONS = ('name', 'mr', 'pysat_name', 'configurations', 'preprocess', 'stats', 'deadline', 'memory_watermark')
+
+
+def solve_request(request: dict) -> dict:
+    """
+    compute a minimal model for a request of the server protocol, the record is like `minimal_model.batch.solve_file`.
+    A request has `clauses` (a list of clauses) or `file` (the path of a CNF file), and optional `id`, `name`, `mr`,
+    `pysat_name`, `configurations`, `preprocess`, `stats`, `deadline`, `memory_watermark`, `simply` and `mem_limit`
+    (megabytes)
+    """
+    from minimal_model.batch import solve_clauses
+    from minimal_model.dimacs import iter_clauses
+    record = {'id': request.get('id')}
+    if 'file' in request:
+        record['file'] = request['file']
+        clauses = iter_clauses(request['file'])
+    elif 'clauses' in request:
+        clauses = request['clauses']
+    else:
+        record.update(status='ERROR', error='a request needs clauses or file')
+        return record
+    options = worker_options({key: request[key] for key in SOLVER_OPTIONS if key in request})
+    (soft, hard) = resource.getrlimit(resource.RLIMIT_AS)
+    try:
+        if request.get('mem_limit'):
+            resource.setrlimit(resource.RLIMIT_AS, (int(request['mem_limit']) * 1024 * 1024, hard))
+        record.update(solve_clauses(clauses, **options))
+    finally:
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+    if request.get('simply') and record.get('model'):
+        record['model'] = [x for x in record['model'] if x > 0]
+    return record
+
+
+def _work(connection):
+    from minimal_model.solvers import get_solver_class
+    get_solver_class()
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        connection.send(solve_request(request))
+
+
+class _Worker(object):
+
+    def __init__(self, context):
+        self.context = context
+        self.request = None
+        self.future = None
+        self.deadline = None
+        self.start()
+
+    def start(self):
+        # a new process group, so processes started by the solver are killed with the worker
+        self.process = Worker(self.context, _work, group=True, duplex=True)
+        self.connection = self.process.connection
+
+    def kill(self):
+        self.process.kill()
+
+
+class WorkerPool(object):
+    """
+    a pool of pre-forked worker processes with pysat and the solvers already imported. \n
+    Every request runs in an idle worker, a request which runs out of its time is killed with its worker and a new
+    worker is started in its place. Workers are forked by a fork server, so starting one is cheap and safe while the
+    pool is used by several threads.
+    """
+
+    def __init__(self, size=None, time_limit=0, mem_limit=0):
+        """
+        :param size: the count of workers, default is the count of CPUs
+        :param time_limit: the default wall clock seconds of a request, zero is unlimited
+        :param mem_limit: the default megabytes of memory of a request, zero is unlimited
+        """
+        self.time_limit = time_limit
+        self.mem_limit = mem_limit
+        self._context = get_context('forkserver')
+        if self._context.get_start_method() == 'forkserver':
+            self._context.set_forkserver_preload(PRELOAD)
+        self._workers = [_Worker(self._context) for _ in range(size or os.cpu_count() or 1)]
+        self._pending = deque()
+        self._lock = threading.Lock()
+        (self._wake_reader, self._wake_writer) = multiprocessing.Pipe(duplex=False)
+        self._closed = False
+        self._thread = threading.Thread(target=self._dispatch, daemon=True)
+        self._thread.start()
+
+    def submit(self, request: dict) -> Future:
+        """
+        :param request: a request of `solve_request`, `time_limit` (wall clock seconds) and `mem_limit` replace the
+        defaults of the pool
+        :return: a future of the record
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('the pool is closed')
+            self._pending.append((request, future))
+            self._wake_writer.send_bytes(b'')
+        return future
+
+    def close(self):
+        """
+        stop the workers after all submitted requests are finished
+        """
+        with self._lock:
+            self._closed = True
+            self._wake_writer.send_bytes(b'')
+        self._thread.join()
+
+    def _dispatch(self):
+        try:
+            while True:
+                with self._lock:
+                    for worker in self._workers:
+                        if not self._pending:
+                            break
+                        if worker.future is None:
+                            self._start(worker, *self._pending.popleft())
+                    busy = [worker for worker in self._workers if worker.future is not None]
+                    if self._closed and not busy and not self._pending:
+                        return
+                deadlines = [worker.deadline for worker in busy if worker.deadline is not None]
+                timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                for worker in wait([self._wake_reader] + busy, timeout):
+                    if worker is self._wake_reader:
+                        worker.recv_bytes()
+                        continue
+                    record = worker.process.recv()
+                    if 'status' not in record:
+                        # the worker exited or failed outside of solving
+                        record = {'id': worker.request.get('id'), 'status': 'ERROR',
+                                  'error': 'worker {}'.format(record['error'])}
+                        self._replace(worker)
+                    self._finish(worker, record)
+                now = time.monotonic()
+                for worker in busy:
+                    if worker.future is not None and worker.deadline is not None and worker.deadline <= now:
+                        request = worker.request
+                        self._replace(worker)
+                        self._finish(worker, {'id': request.get('id'), 'status': 'TIMEOUT'})
+        finally:
+            for worker in self._workers:
+                worker.kill()
+            for (request, future) in self._pending:
+                future.set_result({'id': request.get('id'), 'status': 'ERROR', 'error': 'the pool is closed'})
+
+    def _start(self, worker, request, future):
+        request = dict(request)
+        request.setdefault('mem_limit', self.mem_limit)
+        time_limit = request.pop('time_limit', self.time_limit)
+        worker.request = request
+        worker.future = future
+        worker.deadline = time.monotonic() + time_limit if time_limit else None
+        worker.connection.send(request)
+
+    def _replace(self, worker):
+        """
+        kill the process of a worker and start a new one
+        """
+        worker.kill()
+        worker.start()
+
+    def _finish(self, worker, record):
+        future = worker.future
+        (worker.request, worker.future, worker.deadline) = (None, None, None)
+        future.set_result(record)
+
+
+def _parse(line) -> dict:
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError('a request must be a JSON object')
+    return request
+
+
+def serve_lines(pool: WorkerPool, lines: Iterable, write):
+    """
+    serve JSON-lines requests, records are written as soon as they are finished, so their order may differ from
+    requests. It returns after all requests are finished.
+    :param lines: JSON lines of requests
+    :param write: called with every line of records
+    """
+    lock = threading.Lock()
+    futures = []
+
+    def reply(record):
+        with lock:
+            write(json.dumps(record) + '\n')
+
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            request = _parse(line)
+        except ValueError as e:
+            reply({'id': None, 'status': 'ERROR', 'error': 'bad request: {}'.format(e)})
+            continue
+        future = pool.submit(request)
+        future.add_done_callback(lambda f: reply(f.result()))
+        futures.append(future)
+    for future in futures:
+        future.result()
+
+
+def serve_stdio(pool: WorkerPool, stdin, stdout):
+    """
+    serve requests of stdin, records are written to stdout
+    """
+
+    def write(data):
+        stdout.write(data)
+        stdout.flush()
+
+    serve_lines(pool, stdin, write)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        def write(data):
+            self.wfile.write(data.encode())
+            self.wfile.flush()
+
+        serve_lines(self.server.pool, self.rfile, write)
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve_unix(pool: WorkerPool, path):
+    """
+    serve requests of every connection of a Unix domain socket, until the process is interrupted
+    """
+    if os.path.exists(path):
+        os.unlink(path)
+    server = _UnixServer(path, _Handler)
+    server.pool = pool
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.unlink(path)
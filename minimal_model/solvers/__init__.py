@@ -1,8 +1,62 @@
-import importlib
-from inspect import isclass
-from typing import Tuple
+from typing import Tuple, Iterator, List, TYPE_CHECKING
 
-from pysat.formula import CNF
+from minimal_model.utils import SolverInterrupted
+
+if TYPE_CHECKING:
+    from pysat.formula import CNF
+    from minimal_model.clauses import ClauseBuffer
+
+_solvers = {}
+_builtin_registered = False
+
+
+def register_solver(clz, names=None, mr=None):
+    """
+    register a solver class, so `Solver` can proxy it by name. A solver registered later replaces the one registered
+    with the same name and mr before, including the solvers of this package.
+    It can be used as a decorator.
+    Example:
+    @register_solver
+    class MySolver(_BaseSolver):
+        names = ["MY"]
+    solver = Solver(name="MY")
+    :param clz: the class of solver, it is called with the parameters of `Solver` except name and mr
+    :param names: the names of the solver, default is `clz.names`
+    :param mr: whether the solver applies mr in every step, default is `clz.mr` or False
+    :return: clz
+    """
+    names = names if names is not None else getattr(clz, 'names')
+    mr = mr if mr is not None else bool(getattr(clz, 'mr', False))
+    for name in names:
+        _solvers[(name, mr)] = clz
+    return clz
+
+
+def _register_builtin_solvers():
+    """
+    register the solvers of this package, they are imported at the first time a solver is created
+    """
+    global _builtin_registered
+    if _builtin_registered:
+        return
+    from minimal_model.solvers.solvers import MMSolver, MRSolver, SCCSolver, PortfolioSolver
+    from minimal_model.solvers.mr_solvers import MMSolverWithMR, MRSolverWithMR
+    for clz in (MMSolver, MRSolver, SCCSolver, PortfolioSolver, MMSolverWithMR, MRSolverWithMR):
+        mr = bool(getattr(clz, 'mr', False))
+        for name in clz.names:
+            _solvers.setdefault((name, mr), clz)
+    _builtin_registered = True
+
+
+def get_solver_class(name='MM', mr=False):
+    """
+    :return: the class registered with name and mr
+    """
+    _register_builtin_solvers()
+    clz = _solvers.get((name, bool(mr)))
+    if clz is None:
+        raise RuntimeError('no solver named [{}]'.format(name))
+    return clz
 
 
 class Solver:
@@ -11,7 +65,7 @@ class Solver:
         The constructor need a   solver's name or short name ,other parameter will be given specific solver's constructor
     """
 
-    def __init__(self, name='MM', mr=False, **kwargs):
+    def __init__(self, name='MM', mr=False, cache=None, **kwargs):
         """
         This class can  proxy a specific solver by solver's name or short name. every solver use different algorithm
         The constructor need a solver's name or short name ,other parameters will be given specific solver's
@@ -26,28 +80,24 @@ class Solver:
         print(sat)
         print(model)
 
-        :param name : the algorithm's name MM or MR.
+        :param name : the algorithm's name MM, MR, SCC, PORTFOLIO or a name given to `register_solver`.
         :param mr : whether use mr  algorithm in every step
+        :param cache : a `minimal_model.cache.ResultCache`, `compute_minimal_model` returns the result stored for the
+        same clauses and options without computing, and stores the result it computes
         :param kwargs : the parameters of the specific Solver's constructed function
         """
-        module = importlib.import_module("minimal_model.solvers.mr_solvers" if mr else "minimal_model.solvers.solvers",
-                                         self.__module__)
-        self._real_solver = None
-        for attr in dir(module):
-            if not attr.startswith("_"):
-                clz = getattr(module, attr)
-                if isclass(clz) and hasattr(clz, 'names') and name in getattr(clz,
-                                                                              'names'):
-                    if mr:
-                        if hasattr(clz, "mr") and getattr(clz, "mr"):
-                            self._real_solver = clz(**kwargs)
-                            break
-                    else:
-                        self._real_solver = clz(**kwargs)
-                        break
-        if self._real_solver is None:
-            raise RuntimeError('no solver named [{}]'.format(name))
-        print('compute minimal model use ', name)
+        self._real_solver = get_solver_class(name, mr)(**kwargs)
+        self._cache = cache
+        self._options = dict(kwargs, name=name, mr=bool(mr))
+        self._cache_hit = None
+        self._cache_cpu_time = 0.0
+
+    @property
+    def cache_hit(self):
+        """
+        whether the last result was found in the cache, None if no cache is used
+        """
+        return self._cache_hit
 
     def compute_minimal_model(self) -> Tuple[bool, list]:
         """
@@ -56,12 +106,102 @@ class Solver:
         The second value is a minimal model only if the formula is satisfiability, otherwise the value is None\n
         :return:  (satisfiability,minimal model)
         """
-        return self._real_solver.compute_minimal_model()
+        if self._cache is None:
+            return self._real_solver.compute_minimal_model()
+        (key, result) = self._cache_get()
+        if result is not None:
+            return result
+        (sat, model) = self._real_solver.compute_minimal_model()
+        self._cache_put(key, sat, model)
+        return sat, model
+
+    async def compute_minimal_model_async(self, timeout=None, semaphore=None) -> Tuple[bool, list]:
+        """
+        This method is used to compute a minimal model without blocking the event loop, the computing runs in a
+        thread and is interrupted if the timeout is reached or the task is cancelled. The cache is used like
+        `compute_minimal_model`
+        Example:
+        (sat, model) = await solver.compute_minimal_model_async(timeout=10)
+        :param timeout: wall clock seconds, `asyncio.TimeoutError` is raised when it is reached. None is unlimited
+        :param semaphore: an `asyncio.Semaphore` bounding the count of solves running at the same time, default is
+        one of the event loop with `minimal_model.solvers.solvers.ASYNC_CONCURRENCY` slots
+        :return:  (satisfiability,minimal model)
+        """
+        if self._cache is None:
+            return await self._real_solver.compute_minimal_model_async(timeout, semaphore)
+        (key, result) = self._cache_get()
+        if result is not None:
+            return result
+        (sat, model) = await self._real_solver.compute_minimal_model_async(timeout, semaphore)
+        self._cache_put(key, sat, model)
+        return sat, model
+
+    def _cache_get(self):
+        """
+        look up the result of the formula and options in the cache
+        :return: (the key of the cache, the stored result or None)
+        """
+        from minimal_model.cache import formula_key
+        from minimal_model.utils import get_cpu_time
+        start_cpu_time = get_cpu_time()
+        key = formula_key(self.formula.clauses, self._options)
+        result = self._cache.get(key)
+        self._cache_hit = result is not None
+        if result is not None:
+            self._cache_cpu_time = get_cpu_time() - start_cpu_time
+            self.stats.reset()
+            self.stats.count('cache_hits')
+        return key, result
+
+    def _cache_put(self, key, sat, model):
+        """
+        store a computed result, a model which isn't proven minimal isn't stored
+        """
+        if self.proven_minimal:
+            self._cache.put(key, sat, model)
+        self.stats.count('cache_misses')
+
+    def is_minimal(self, model) -> bool:
+        """
+        whether model is a minimal model of the formula, the structures built for the formula are reused by the next
+        check until clauses are added
+        :param model: a list of literals, the atoms which aren't positive in it are false
+        """
+        return self._real_solver.is_minimal(model)
+
+    def check_models(self, models, jobs=None) -> List[dict]:
+        """
+        check many models against the formula, a large batch is split among `jobs` processes
+        Example:
+        for (model, result) in zip(models, solver.check_models(models)):
+            if not result['minimal']:
+                print(model, result['smaller'])
+        :param jobs: the count of processes, default is the `jobs` given to the solver or the count of CPUs
+        :return: for every model, `satisfied` (whether it satisfies the formula), `minimal`, and `smaller`, the true
+        atoms of a model which are a proper subset of its true atoms, None if there isn't one
+        """
+        return self._real_solver.check_models(models, jobs)
+
+    def interrupt(self):
+        """
+        stop computing from another thread, the computing raises `SolverInterrupted`
+        """
+        self._real_solver.interrupt()
+
+    def iter_minimal_models(self, limit=None) -> Iterator[List[int]]:
+        """
+        This method is used to enumerate distinct minimal models, every model is yielded as soon as it is found.
+        Example:
+        for model in solver.iter_minimal_models(limit=10):
+            print(model)
+        :param limit: the max count of models, None is unlimited
+        """
+        return self._real_solver.iter_minimal_models(limit)
 
     @property
-    def formula(self) -> CNF:
+    def formula(self) -> 'ClauseBuffer':
         """
-        get the original CNF formula
+        get the original formula, see `minimal_model.clauses.ClauseBuffer`
         """
         return self._real_solver.formula
 
@@ -71,22 +211,59 @@ class Solver:
         """
         self._real_solver.add_clause(clause)
 
-    def append_formula(self, formula: CNF):
+    def append_formula(self, formula: 'CNF'):
         """
         append formula to formula
+        :param formula: a CNF formula, a `ClauseStore` such as `minimal_model.dimacs.read_store`, or an iterable of
+        clauses such as `minimal_model.dimacs.iter_clauses`
         """
         self._real_solver.append_formula(formula)
 
     def print_status(self):
-        return self._real_solver.print_status()
+        if self._cache_hit:
+            print("CPU time              : %g s" % self.cpu_time)
+        else:
+            self._real_solver.print_status()
+        if self._cache is not None:
+            print("Cache                 : {} ".format('hit' if self._cache_hit else 'miss'))
 
     @property
     def compute_model_count(self) -> int:
-        return self._real_solver.compute_model_count
+        return 0 if self._cache_hit else self._real_solver.compute_model_count
+
+    @property
+    def check_model_count(self) -> int:
+        """
+        get the count of checking models, it is zero if the solver doesn't check models
+        """
+        return 0 if self._cache_hit else getattr(self._real_solver, 'check_model_count', 0)
+
+    @property
+    def proven_minimal(self) -> bool:
+        """
+        whether the last model is proven minimal, it is False if computing was stopped by `deadline` or
+        `memory_watermark` and returned the smallest model found before
+        """
+        return True if self._cache_hit else getattr(self._real_solver, 'proven_minimal', True)
+
+    @property
+    def winner(self):
+        """
+        get the configuration (name, mr, pysat_name) which won a portfolio, it is None for other solvers
+        """
+        return None if self._cache_hit else getattr(self._real_solver, 'winner', None)
+
+    @property
+    def stats(self):
+        """
+        get the time of every phase and the counters of the last computing, see `minimal_model.stats.Stats`.
+        Set `solver.stats.callback` to be called every time a phase ends
+        """
+        return self._real_solver.stats
 
     @property
     def cpu_time(self) -> int:
         """
         get the cpu time of solving minimal model
         """
-        return self._real_solver.cpu_time
+        return self._cache_cpu_time if self._cache_hit else self._real_solver.cpu_time
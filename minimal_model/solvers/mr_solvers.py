@@ -1,12 +1,7 @@
 #!/usr/bin/env python
-from typing import Tuple
+from typing import Tuple, List
 
-import pysat.solvers
-import pysat.formula
-
-import copy
-from minimal_model.solvers.utils import *
-from minimal_model.solvers.solvers import MMSolver, MRSolver
+from minimal_model.solvers.solvers import MMSolver, MRSolver, _IncrementalReducer
 import minimal_model.utils
 
 
@@ -16,7 +11,7 @@ class MMSolverWithMR(MMSolver):
     """
     mr = True
 
-    def compute_minimal_model(self) -> Tuple[bool, List[int]]:
+    def _compute_minimal_model(self) -> Tuple[bool, List[int]]:
         """
         This method is used to  a minimal model,it will return a `tuple`.
         The first value means whether a CNF formula given to the solver is satisfiability
@@ -25,22 +20,23 @@ class MMSolverWithMR(MMSolver):
         """
         model = None
         start_cpu_time = minimal_model.utils.get_cpu_time()
-        clauses = copy.deepcopy(self._formula.clauses)
-        self._pysat_sovlver = pysat.solvers.Solver(self._pysat_name)
-        self._pysat_sovlver.append_formula(self._formula)
+        formula_nv = self._formula.nv
+        self._create_pysat_solver()
         self._compute_model_count = 1
-        while self._pysat_sovlver.solve():
-            self._compute_model_count += 1
-            model = self._pysat_sovlver.get_model()
-            clauses = mr(clauses, model)
-            self._pysat_sovlver.delete()
-            self._pysat_sovlver = pysat.solvers.Solver(self._pysat_name)
-            for clause in clauses:
-                self._pysat_sovlver.add_clause(clause)
-            positive_list = [-item for item in model if item > 0]
-            self._pysat_sovlver.add_clause(positive_list)
-        self._pysat_sovlver.delete()
-        self._cpu_time = minimal_model.utils.get_cpu_time() - start_cpu_time
+        reducer = _IncrementalReducer(self, formula_nv)
+        try:
+            while reducer.solve():
+                self._compute_model_count += 1
+                model = self._pysat_sovlver.get_model()[:formula_nv]
+                reducer.reduce(model)
+                if self._out_of_budget():
+                    break
+        except minimal_model.utils.DeadlineReached:
+            if model is None:
+                raise
+        finally:
+            self._delete_pysat_solver()
+            self._cpu_time = minimal_model.utils.get_cpu_time() - start_cpu_time
         return model is not None, model
 
 
@@ -50,7 +46,7 @@ class MRSolverWithMR(MRSolver):
         It extends MRSolver. This Solver use mr result of last step  in next step. \n
     """
 
-    def compute_minimal_model(self) -> Tuple[bool, List[int]]:
+    def _compute_minimal_model(self) -> Tuple[bool, List[int]]:
         """
         This method is used to  a minimal model,it will return a `tuple`.
         The first value means whether a CNF formula given to the solver is satisfiability
@@ -58,25 +54,28 @@ class MRSolverWithMR(MRSolver):
         :return:  (satisfiability,minimal model)
         """
         start_cpu_time = minimal_model.utils.get_cpu_time()
-        clauses = copy.deepcopy(self._formula.clauses)
-        formula = copy.deepcopy(self._formula)
+        formula = self._formula
         model = None
-        self._pysat_sovlver = pysat.solvers.Solver(self._pysat_name)
-        self._pysat_sovlver.append_formula(self._formula)
         self._compute_model_count = 1
         self._check_model_count = 0
-        while self._pysat_sovlver.solve():
-            model = self._pysat_sovlver.get_model()
-            clauses = mr(clauses, model)
-            if self._check(copy.deepcopy(clauses), formula.nv, copy.deepcopy(model)):
-                break
-            self._pysat_sovlver.delete()
-            self._pysat_sovlver = pysat.solvers.Solver(self._pysat_name)
-            for clause in clauses:
-                self._pysat_sovlver.add_clause(clause)
-            positive_list = [-item for item in model if item > 0]
-            self._pysat_sovlver.add_clause(positive_list)
-            self._compute_model_count += 1
-        self._pysat_sovlver.delete()
-        self._cpu_time = minimal_model.utils.get_cpu_time() -start_cpu_time
+        self._dependency = None
+        self._create_pysat_solver()
+        reducer = _IncrementalReducer(self, formula.nv)
+        try:
+            while reducer.solve():
+                model = self._pysat_sovlver.get_model()[:formula.nv]
+                # the dependency graph kept by _check applies mr of every step
+                if self._check(self._formula_store(), formula.nv, model):
+                    break
+                reducer.reduce(model)
+                self._compute_model_count += 1
+                if self._out_of_budget():
+                    break
+        except minimal_model.utils.DeadlineReached:
+            if model is None:
+                raise
+        finally:
+            self._delete_pysat_solver()
+            self._dependency = None
+            self._cpu_time = minimal_model.utils.get_cpu_time() - start_cpu_time
         return model is not None, model
@@ -1,31 +1,135 @@
 #!/usr/bin/env python
-from typing import Tuple
+import asyncio
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Tuple, Iterator, List
 
 import pysat.solvers
-import pysat.formula
-from pysat.formula import CNF
-from minimal_model.graph import Graph, StronglyConnectedGraph
-import copy
-from minimal_model.solvers.utils import *
+from minimal_model.clauses import ClauseBuffer, ClauseStore, OccurrenceIndex, ClauseReduction
+from minimal_model.graph import StronglyConnectedGraph
+from minimal_model.stats import Stats
+from minimal_model.solvers.utils import ReducedDependencyGraph, compute_s
 import minimal_model.utils
+import minimal_model.portfolio
+import minimal_model.preprocess
+import minimal_model.decompose
+import minimal_model.minimality
+from minimal_model.utils import SolverInterrupted
+
+# the count of solves run at the same time by `compute_minimal_model_async` in an event loop, if no semaphore is given
+ASYNC_CONCURRENCY = os.cpu_count() or 1
+
+# pysat can't interrupt these solvers, they are computed in a process killed on interruption
+_UNINTERRUPTIBLE_SOLVERS = ('lingeling', 'cadical103', 'cadical153', 'cadical195', 'cadical300', 'kissat404')
+_UNINTERRUPTIBLE = set()
+for _name in _UNINTERRUPTIBLE_SOLVERS:
+    _UNINTERRUPTIBLE.update(getattr(pysat.solvers.SolverNames, _name, ()))
+
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _default_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(ASYNC_CONCURRENCY)
+    return semaphore
+
+
+class _DeadlineTimer(object):
+    """
+    interrupt a pysat call when the deadline is reached
+    """
+
+    def __init__(self, lock, pysat_solver, seconds):
+        """
+        :param lock: the lock which guards the pysat solver
+        """
+        self._lock = lock
+        self._pysat_solver = pysat_solver
+        self._stopped = False
+        self._fired = False
+        self._timer = threading.Timer(seconds, self._fire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _fire(self):
+        with self._lock:
+            if not self._stopped:
+                self._fired = True
+                self._pysat_solver.interrupt()
+
+    def stop(self) -> bool:
+        """
+        :return: whether the pysat solver was interrupted
+        """
+        self._timer.cancel()
+        with self._lock:
+            self._stopped = True
+        return self._fired
 
 
 class _BaseSolver(object):
     """
     define some basic function
     """
+    # whether variable-disjoint components of the formula are solved separately
+    _split_components = True
 
-    def __init__(self, pysat_name="m22", bootstrap_with=None):
+    def __init__(self, pysat_name="m22", bootstrap_with=None, preprocess=False, jobs=None, incremental=False,
+                 deadline=None, memory_watermark=None):
         """
         :param pysat_name :The name of  SAT's solver
+        :param bootstrap_with: the clauses of the formula, a `minimal_model.clauses.ClauseBuffer` is used as the
+        formula without copying, such as one which stores literals in a mapped file
+        :param preprocess: whether simplify the formula by `minimal_model.preprocess` before computing
+        :param jobs: the count of processes solving variable-disjoint components at the same time, default is the
+        count of CPUs
+        :param incremental: keep the pysat solver and the minimal model between computings, only the clauses added
+        after the last computing are given to the pysat solver, preprocessing is skipped
+        :param deadline: wall clock seconds of a computing, when they are used up the smallest model found so far is
+        returned and `proven_minimal` is False. A running pysat call is interrupted at the deadline, except calls of
+        cadical, kissat and lingeling which pysat can't interrupt. If no model is found before it,
+        `minimal_model.utils.DeadlineReached` is raised
+        :param memory_watermark: megabytes of resident memory, computing stops like `deadline` when it is exceeded
         """
+        self._preprocess = preprocess
+        self._deadline = deadline
+        self._memory_watermark = memory_watermark
+        # whether the deadline and memory watermark apply, only `compute_minimal_model` stops early
+        self._anytime = False
+        self._stop_time = None
+        self._proven_minimal = True
+        self._jobs = jobs
+        self._incremental = incremental
+        self._incremental_solver = None
+        # the count of clauses of the formula given to the kept pysat solver
+        self._incremental_loaded = 0
+        # the max atom of the formula when the kept pysat solver was created, selector literals are above it
+        self._incremental_nv = 0
+        self._incremental_top = 0
+        self._incremental_result = None
+        self._checker = None
+        # the count of clauses of the formula the checker was built for
+        self._checker_clauses = 0
         self._pysat_sovlver = None
+        # (formula, count of clauses, store) built by `_formula_store`
+        self._store = None
         self._compute_model_count = 0
         self._pysat_name = pysat_name
-        self._formula = CNF()
+        self._formula = bootstrap_with if isinstance(bootstrap_with, ClauseBuffer) else ClauseBuffer()
         self._cpu_time = 0.0
-        if bootstrap_with:
-            self._formula.from_clauses(bootstrap_with)
+        self._stats = Stats()
+        self._interruptible = False
+        self._interrupted = False
+        self._cancel = None
+        # guard native solvers, so `interrupt` never touches a deleted one
+        self._native_lock = threading.Lock()
+        if bootstrap_with and self._formula is not bootstrap_with:
+            self._formula.extend(bootstrap_with)
 
     def print_status(self):
         used_mem = minimal_model.utils.get_used_memory()
@@ -45,9 +149,222 @@ class _BaseSolver(object):
         return self._cpu_time
 
     @property
-    def formula(self) -> CNF:
+    def proven_minimal(self) -> bool:
+        """
+        whether the last model is proven minimal, it is False if computing was stopped by the deadline or the memory
+        watermark, then the model is only the smallest one found before
+        """
+        return self._proven_minimal
+
+    def _out_of_budget(self) -> bool:
+        """
+        whether the deadline or the memory watermark is reached, computing which has a model should stop and return it
+        """
+        if not self._anytime:
+            return False
+        if self._stop_time is None or time.monotonic() < self._stop_time:
+            if not self._memory_watermark or minimal_model.utils.get_used_memory() < self._memory_watermark:
+                return False
+        self._proven_minimal = False
+        self._stats.count('anytime_stops')
+        return True
+
+    @property
+    def stats(self) -> Stats:
+        """
+        get the time of every phase and the counters of the last computing, see `minimal_model.stats.Stats`
+        """
+        return self._stats
+
+    def _formula_store(self) -> ClauseStore:
+        """
+        the formula as a `ClauseStore`, it is built once and kept until computing ends or the formula changes
+        """
+        formula = self._formula
+        if self._store is None or self._store[0] is not formula or self._store[1] != len(formula):
+            self._store = (formula, len(formula), formula.store())
+        return self._store[2]
+
+    def _create_pysat_solver(self):
+        """
+        create the pysat solver loaded with the formula
+        """
+        self._pysat_sovlver = pysat.solvers.Solver(self._pysat_name)
+        self._pysat_sovlver.append_formula(self._formula)
+        self._stats.count('clauses_added', len(self._formula))
+        return self._pysat_sovlver
+
+    def _delete_pysat_solver(self):
+        with self._native_lock:
+            self._pysat_sovlver.delete()
+
+    def _time_left(self, pysat_solver):
+        """
+        :return: seconds until the deadline, None if there is no deadline or pysat can't interrupt the solver
+        """
+        if not self._anytime or self._stop_time is None:
+            return None
+        if type(pysat_solver.solver).__name__.lower() in _UNINTERRUPTIBLE_SOLVERS:
+            return None
+        return self._stop_time - time.monotonic()
+
+    def _call_pysat(self, pysat_solver, assumptions=()) -> bool:
+        """
+        solve by a pysat solver, it raises `SolverInterrupted` if `interrupt` is called and `DeadlineReached` if the
+        deadline stops it
+        """
+        if self._interrupted:
+            raise SolverInterrupted()
+        left = self._time_left(pysat_solver)
+        if left is None and not self._interruptible:
+            return pysat_solver.solve(assumptions=assumptions)
+        if left is not None and left <= 0:
+            self._reach_deadline()
+        timer = _DeadlineTimer(self._native_lock, pysat_solver, left) if left is not None else None
+        try:
+            # the GIL is released while solving, so other threads and the event loop keep running
+            result = pysat_solver.solve_limited(assumptions=assumptions, expect_interrupt=True)
+        finally:
+            fired = timer is not None and timer.stop()
+        if self._interrupted:
+            raise SolverInterrupted()
+        if fired:
+            # the interrupt may come after the call finished, it would stop the next call
+            pysat_solver.clear_interrupt()
+            if result is None:
+                self._reach_deadline()
+        if result is None:
+            raise SolverInterrupted()
+        return result
+
+    def _reach_deadline(self):
+        self._proven_minimal = False
+        self._stats.count('anytime_stops')
+        raise minimal_model.utils.DeadlineReached()
+
+    def _solve(self, assumptions=()) -> bool:
+        with self._stats.phase('sat'):
+            self._stats.count('sat_calls')
+            return self._call_pysat(self._pysat_sovlver, assumptions)
+
+    def _native_solvers(self):
+        """
+        the native solvers `interrupt` stops
+        """
+        return [self._pysat_sovlver] if self._pysat_sovlver is not None else []
+
+    def _pysat_names(self) -> List[str]:
+        return [self._pysat_name]
+
+    def interrupt(self):
+        """
+        stop computing from another thread, the computing raises `SolverInterrupted` and deletes its pysat solvers.
+        A running pysat call is stopped at once only when computing is started by `compute_minimal_model_async`,
+        otherwise computing stops after it
+        """
+        with self._native_lock:
+            self._interrupted = True
+            if self._cancel is not None:
+                self._cancel.send_bytes(b'')
+            if self._interruptible:
+                for solver in self._native_solvers():
+                    solver.interrupt()
+
+    @contextmanager
+    def _cancel_connection(self):
+        """
+        a connection for computing in other processes, it can be read as soon as `interrupt` is called
+        """
+        import multiprocessing
+        (reader, writer) = multiprocessing.Pipe(duplex=False)
+        with self._native_lock:
+            if self._interrupted:
+                raise SolverInterrupted()
+            self._cancel = writer
+        try:
+            yield reader
+        finally:
+            with self._native_lock:
+                self._cancel = None
+            reader.close()
+            writer.close()
+
+    def _race(self, configurations, timeout=None, options=None) -> dict:
+        """
+        compute by configurations in separate processes by `minimal_model.portfolio.race`, `interrupt` kills them.
+        The deadline left and the memory watermark are given to every configuration
+        :param options: other parameters of every configuration
+        """
+        deadline = self._deadline
+        if self._anytime and self._stop_time is not None:
+            deadline = max(0.0, self._stop_time - time.monotonic())
+        options = dict(options or {}, deadline=deadline, memory_watermark=self._memory_watermark)
+        with self._cancel_connection() as cancel:
+            result = minimal_model.portfolio.race(self._formula.clauses, configurations, timeout, cancel, options)
+        self._proven_minimal = result['proven_minimal']
+        self._cpu_time = result['cpu_time']
+        self._compute_model_count = result['compute_model_count']
+        self._check_model_count = result['check_model_count']
+        self._stats.load(result['stats'])
+        return result
+
+    def _options(self) -> dict:
+        """
+        the parameters of the solver besides pysat_name, the deadline and the memory watermark, a copy of the solver
+        in another process is created with them
+        """
+        return {'preprocess': self._preprocess, 'incremental': self._incremental, 'jobs': self._jobs}
+
+    def _compute_in_process(self) -> Tuple[bool, List[int]]:
+        """
+        compute by a copy of the solver in another process, which is killed by `interrupt`
+        """
+        configuration = (self.names[0], bool(getattr(self, 'mr', False)), self._pysat_name)
+        result = self._race([configuration], options=self._options())
+        return result['sat'], result['model']
+
+    async def compute_minimal_model_async(self, timeout=None, semaphore: asyncio.Semaphore = None) \
+            -> Tuple[bool, List[int]]:
+        """
+        compute a minimal model in a thread of the event loop's executor, the event loop keeps running meanwhile.
+        If the timeout is reached or the task is cancelled, the computing is interrupted and its pysat solvers are
+        deleted before `asyncio.TimeoutError` or `asyncio.CancelledError` is raised.
+        Example:
+        (sat, model) = await solver.compute_minimal_model_async(timeout=10)
+        :param timeout: wall clock seconds, None is unlimited
+        :param semaphore: bound the count of solves running at the same time, default is a semaphore of the event
+        loop with `ASYNC_CONCURRENCY` slots
+        :return:  (satisfiability,minimal model)
+        """
+        async with semaphore or _default_semaphore():
+            self._interrupted = False
+            if _UNINTERRUPTIBLE.intersection(self._pysat_names()):
+                compute = self._compute_in_process
+            else:
+                self._interruptible = True
+                compute = self._compute_formula
+            future = asyncio.get_running_loop().run_in_executor(None, compute)
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self.interrupt()
+                # wait for the thread, so no native solver is left behind
+                await asyncio.wait([future])
+                if not future.cancelled():
+                    future.exception()
+                raise
+            finally:
+                self._interruptible = False
+                self._store = None
+
+    def _add_clause(self, clause):
+        self._stats.count('clauses_added')
+        self._pysat_sovlver.add_clause(clause)
+
+    @property
+    def formula(self) -> ClauseBuffer:
         """
-        get the original CNF formula
+        get the original formula, clauses are read from its arrays as lists when they are iterated
         """
         return self._formula
 
@@ -60,19 +377,366 @@ class _BaseSolver(object):
     def append_formula(self, formula):
         """
         append formula to formula
+        :param formula: a CNF formula, a `ClauseStore` such as `minimal_model.dimacs.read_store` which is copied by its
+        arrays, or an iterable of clauses such as `minimal_model.dimacs.iter_clauses`
         """
-        for clause in formula.clauses:
-            self._formula.append(clause)
+        self._formula.extend(formula)
+
+    def _minimality_checker(self) -> 'minimal_model.minimality.MinimalityChecker':
+        """
+        the checker of the formula, it is built again after clauses are added
+        """
+        if self._checker is None or self._checker_clauses != len(self._formula):
+            if self._checker is not None:
+                self._checker.delete()
+            self._checker = minimal_model.minimality.MinimalityChecker(self._formula, self._pysat_name)
+            self._checker_clauses = len(self._formula)
+        return self._checker
+
+    def is_minimal(self, model) -> bool:
+        """
+        whether model is a minimal model of the formula, the structures of the formula are kept for the next check
+        :param model: a list of literals, the atoms which aren't positive in it are false
+        """
+        return self._minimality_checker().is_minimal(model)
+
+    def check_models(self, models, jobs=None) -> List[dict]:
+        """
+        check many models, see `minimal_model.minimality.MinimalityChecker.check_models`
+        :param jobs: the count of processes, default is `jobs` of the solver
+        :return: `satisfied`, `minimal` and `smaller` (the true atoms of a smaller model) of every model
+        """
+        return self._minimality_checker().check_models(models, jobs if jobs is not None else self._jobs)
 
     def compute_minimal_model(self) -> Tuple[bool, list]:
         """
         This method is used to  a minimal model,it will return a `tuple`.
         The first value means whether a CNF formula given to the solver is satisfiability
         The second value is a minimal model only if the formula is satisfiability, otherwise the value is None\n
+        The formula is simplified first, a Horn formula is solved without pysat and otherwise only the residual
+        formula is given to `_compute_minimal_model`
         :return:  (satisfiability,minimal model)
         """
+        # an interrupt of an idle solver or of the last computing doesn't stop this one
+        self._interrupted = False
+        try:
+            return self._compute_formula()
+        finally:
+            self._store = None
+
+    def _compute_formula(self) -> Tuple[bool, list]:
+        """
+        `compute_minimal_model` without clearing interrupts, so one which comes before computing starts isn't lost
+        """
+        self._stats.reset()
+        self._proven_minimal = True
+        self._anytime = self._deadline is not None or bool(self._memory_watermark)
+        self._stop_time = time.monotonic() + self._deadline if self._deadline is not None else None
+        if self._incremental:
+            return self._compute_incremental()
+        if not self._preprocess:
+            return self._compute_split()
+        start_cpu_time = minimal_model.utils.get_cpu_time()
+        formula = self._formula
+        parts = []
+        with self._stats.phase('preprocess'):
+            result = minimal_model.preprocess.preprocess(formula.clauses)
+            self._stats.count('residual_clauses', len(result.clauses))
+            horn_true = None
+            if result.sat and result.horn:
+                horn_true = minimal_model.preprocess.horn_minimal_model(result.clauses)
+            elif result.sat and self._split_components:
+                parts = minimal_model.decompose.components(result.clauses)
+        if not result.sat or (result.horn and horn_true is None):
+            (sat, model) = (False, None)
+        elif result.horn:
+            (sat, model) = (True, minimal_model.preprocess.expand_model(result.true | horn_true, formula.nv))
+        else:
+            preprocess_cpu_time = minimal_model.utils.get_cpu_time() - start_cpu_time
+            # other atoms are fixed by preprocessing, pysat gives them any value if computing stops before minimizing
+            residual_atoms = {abs(x) for clause in result.clauses for x in clause}
+            try:
+                if len(parts) > 1:
+                    (sat, true) = self._compute_components(parts)
+                else:
+                    self._formula = ClauseBuffer(result.clauses)
+                    # the lists of the residual formula aren't needed while it is solved
+                    result.clauses = None
+                    (sat, model) = self._compute_minimal_model()
+                    true = {x for x in model if x > 0} if sat else None
+            finally:
+                self._formula = formula
+            if sat:
+                model = minimal_model.preprocess.expand_model(result.true | (true & residual_atoms), formula.nv)
+            else:
+                model = None
+            self._cpu_time += preprocess_cpu_time
+            return sat, model
+        self._compute_model_count = 0
+        self._check_model_count = 0
+        self._cpu_time = minimal_model.utils.get_cpu_time() - start_cpu_time
+        return sat, model
+
+    def _compute_split(self) -> Tuple[bool, list]:
+        """
+        compute a minimal model of the formula without preprocessing, variable-disjoint components are still solved
+        separately
+        """
+        formula = self._formula
+        parts = minimal_model.decompose.store_components(self._formula_store()) if self._split_components else []
+        if len(parts) < 2:
+            return self._compute_minimal_model()
+        try:
+            (sat, true) = self._compute_components(parts)
+        finally:
+            self._formula = formula
+        return sat, minimal_model.preprocess.expand_model(true, formula.nv) if sat else None
+
+    def _compute_minimal_model(self) -> Tuple[bool, list]:
+        """
+        compute a minimal model of the formula without preprocessing, like `compute_minimal_model`
+        """
         pass
 
+    def _compute_incremental(self) -> Tuple[bool, List[int]]:
+        """
+        compute a minimal model by the pysat solver kept since the last computing, only the clauses added after it are
+        given to the pysat solver. A minimal model of the last formula which satisfies the new clauses is still a
+        minimal model, so it is returned at once. Otherwise pysat prefers the values of the last model, and the model
+        it finds is minimized by selector literals retired afterwards, so the pysat solver can be kept.
+        """
+        start_cpu_time = minimal_model.utils.get_cpu_time()
+        formula = self._formula
+        formula_nv = formula.nv
+        new = formula.clauses[self._incremental_loaded:]
+        self._compute_model_count = 0
+        if self._incremental_solver is not None and any(self._incremental_nv < abs(x) <= self._incremental_top
+                                                        for clause in new for x in clause):
+            # new atoms are selector literals of the kept pysat solver
+            self._delete_incremental_solver()
+        if self._incremental_solver is None:
+            self._incremental_solver = self._create_pysat_solver()
+            self._incremental_nv = self._incremental_top = formula_nv
+        else:
+            self._pysat_sovlver = self._incremental_solver
+            # the kept solver may be interrupted by the last computing
+            try:
+                self._pysat_sovlver.clear_interrupt()
+            except NotImplementedError:
+                pass
+            for clause in new:
+                self._add_clause(clause)
+        self._incremental_loaded = len(formula.clauses)
+        try:
+            last = self._incremental_result
+            if last is not None and not last[0]:
+                return last
+            if last is not None:
+                model = last[1] + [-x for x in range(len(last[1]) + 1, formula_nv + 1)]
+                true = {x for x in model if x > 0}
+                if all(any((x > 0) == (abs(x) in true) for x in clause) for clause in new):
+                    self._incremental_result = (True, model)
+                    return True, model
+                try:
+                    self._pysat_sovlver.set_phases(model)
+                except NotImplementedError:
+                    pass
+            self._compute_model_count += 1
+            if not self._solve():
+                self._incremental_result = (False, None)
+                return False, None
+            model = self._pysat_sovlver.get_model()[:formula_nv]
+            if last is not None:
+                # smaller models are preferred while minimizing
+                try:
+                    self._pysat_sovlver.set_phases([-x for x in range(1, formula_nv + 1)])
+                except NotImplementedError:
+                    pass
+            reducer = _IncrementalReducer(self, max(self._incremental_top, formula_nv), assume=True)
+            try:
+                model = self._minimize(reducer, model)
+            finally:
+                reducer.retire()
+                self._incremental_top = reducer.top
+            # a model which isn't proven minimal can't be returned again for new clauses
+            self._incremental_result = (True, model) if self._proven_minimal else None
+            return True, model
+        finally:
+            self._cpu_time = minimal_model.utils.get_cpu_time() - start_cpu_time
+
+    def _delete_incremental_solver(self):
+        """
+        delete the pysat solver kept by the incremental mode, the next computing loads the whole formula again
+        """
+        with self._native_lock:
+            if self._incremental_solver is not None:
+                self._incremental_solver.delete()
+                if self._pysat_sovlver is self._incremental_solver:
+                    self._pysat_sovlver = None
+                self._incremental_solver = None
+
+    def _compute_components(self, parts) -> Tuple[bool, set]:
+        """
+        compute minimal models of variable-disjoint components by `minimal_model.decompose.solve`, the minimal model
+        of the formula is their union
+        :param parts: components given by `minimal_model.decompose.components`
+        :return: (satisfiability, the true atoms)
+        """
+        self._stats.count('components', len(parts))
+        with self._cancel_connection() as cancel:
+            (results, stats) = minimal_model.decompose.solve(self, parts, self._jobs, cancel)
+        for data in stats:
+            self._stats.merge(data)
+        self._cpu_time = sum(result['cpu_time'] for result in results)
+        self._compute_model_count = sum(result['compute_model_count'] for result in results)
+        self._check_model_count = sum(result['check_model_count'] for result in results)
+        self._proven_minimal = all(result['minimal'] for result in results)
+        if not all(result['sat'] for result in results):
+            return False, None
+        true = set()
+        for ((atoms, _), result) in zip(parts, results):
+            true.update(atoms[x - 1] for x in result['true'])
+        return True, true
+
+    def _solve_component(self, clauses) -> dict:
+        """
+        compute a minimal model of a component without preprocessing, a Horn component is solved by forward chaining
+        :return: `sat`, `true` (the true atoms), `cpu_time`, `compute_model_count` and `check_model_count`
+        """
+        if minimal_model.preprocess.is_horn(clauses):
+            start_cpu_time = minimal_model.utils.get_cpu_time()
+            true = minimal_model.preprocess.horn_minimal_model(clauses)
+            return {'sat': true is not None, 'true': sorted(true or ()), 'minimal': True, 'compute_model_count': 0,
+                    'check_model_count': 0, 'cpu_time': minimal_model.utils.get_cpu_time() - start_cpu_time}
+        self._formula = ClauseBuffer(clauses)
+        (sat, model) = self._compute_minimal_model()
+        return {'sat': sat, 'true': [x for x in model if x > 0] if sat else [], 'minimal': self._proven_minimal,
+                'compute_model_count': self._compute_model_count,
+                'check_model_count': getattr(self, '_check_model_count', 0), 'cpu_time': self._cpu_time}
+
+    def iter_minimal_models(self, limit=None) -> Iterator[List[int]]:
+        """
+        This method is used to enumerate distinct minimal models, every model is yielded as soon as it is found.
+        One pysat solver is kept until the generator is exhausted or closed, after a minimal model is found a clause
+        blocking all of its supersets is added to it.
+        :param limit: the max count of models, None is unlimited
+        """
+        start_cpu_time = minimal_model.utils.get_cpu_time()
+        formula_nv = self._formula.nv
+        self._compute_model_count = 0
+        self._stats.reset()
+        self._anytime = False
+        self._interrupted = False
+        self._create_pysat_solver()
+        try:
+            top = formula_nv
+            count = 0
+            while limit is None or count < limit:
+                self._compute_model_count += 1
+                if not self._solve():
+                    break
+                model = self._pysat_sovlver.get_model()[:formula_nv]
+                reducer = _IncrementalReducer(self, top, assume=True)
+                model = self._minimize(reducer, model)
+                reducer.retire()
+                top = reducer.top
+                count += 1
+                self._cpu_time = minimal_model.utils.get_cpu_time() - start_cpu_time
+                yield model
+                positive_list = [-x for x in model if x > 0]
+                if not positive_list:
+                    break
+                self._add_clause(positive_list)
+        finally:
+            self._delete_pysat_solver()
+            self._store = None
+            self._cpu_time = minimal_model.utils.get_cpu_time() - start_cpu_time
+
+    def _minimize(self, reducer, model) -> List[int]:
+        """
+        compute a minimal model which is a subset of model, by the pysat solver of the reducer
+        """
+        while True:
+            if self._out_of_budget():
+                return model
+            reducer.reduce(model)
+            self._compute_model_count += 1
+            try:
+                if not reducer.solve():
+                    return model
+            except minimal_model.utils.DeadlineReached:
+                return model
+            model = self._pysat_sovlver.get_model()[:len(model)]
+
+
+class _IncrementalReducer(object):
+    """
+    apply mr to a pysat solver which is kept alive during the whole computing. \n
+    Atoms false in a model stay false later, so every step only adds unit clauses for the atoms that became false.
+    The clause asking for a smaller model is guarded by a selector literal and retired in the next step.
+    """
+
+    def __init__(self, solver: _BaseSolver, formula_nv, assume=False):
+        """
+        :param solver: the solver whose pysat solver is loaded with the formula, its `_solve` is used to solve
+        :param formula_nv: the max atom of the formula or selector literal used before, selector literals are
+        allocated above it
+        :param assume: if it is true, false atoms are passed as assumptions instead of unit clauses, so the pysat
+        solver can be reused after `retire`
+        """
+        self._owner = solver
+        self._solver = solver._pysat_sovlver
+        self._stats = solver.stats
+        self._top = formula_nv
+        self._assume = assume
+        self._assumptions = []
+        self._selector = None
+        self._positive = None
+
+    @property
+    def top(self) -> int:
+        """
+        the max selector literal allocated
+        """
+        return self._top
+
+    def solve(self) -> bool:
+        """
+        solve the formula reduced by all models given to `reduce`
+        """
+        return self._owner._solve(self._assumptions if self._selector is None else self._assumptions + [self._selector])
+
+    def reduce(self, model):
+        """
+        reduce the formula by model, next model will be a proper subset of model
+        """
+        positive = {x for x in model if x > 0}
+        if self._positive is None:
+            falsified = [x for x in model if x < 0]
+        else:
+            falsified = [-x for x in self._positive - positive]
+        if self._assume:
+            self._assumptions.extend(falsified)
+        else:
+            for item in falsified:
+                self._solver.add_clause([item])
+            self._stats.count('clauses_added', len(falsified))
+        self.retire()
+        self._top += 1
+        self._selector = self._top
+        self._solver.add_clause([-self._selector] + [-x for x in positive])
+        self._stats.count('clauses_added')
+        self._positive = positive
+
+    def retire(self):
+        """
+        disable the clause asking for a smaller model
+        """
+        if self._selector is not None:
+            self._solver.add_clause([-self._selector])
+            self._stats.count('clauses_added')
+            self._selector = None
+
 
 class MMSolver(_BaseSolver):
     names = ["MM"]
@@ -85,17 +749,23 @@ class MMSolver(_BaseSolver):
     def __getattr__(self, name):
         return getattr(self._pysat_sovlver, name)
 
-    def __init__(self, pysat_name='m22', bootstrap_with=None):
+    def __init__(self, pysat_name='m22', bootstrap_with=None, preprocess=False, jobs=None, incremental=False,
+                 deadline=None, memory_watermark=None):
         """
             This  solver compute minimal model without check \n When pysat get a model ,next, solver will get
             a new model that is subset of last model and check it. until find a minimal model.\n The solver also proxy
             pysat's solver function, ie you can call  such as `append_formula`
         :param pysat_name :The name of  SAT's solver, t will be used to instantiate pysat.solvers.Solver as param named pysat_name
         :param bootstrap_with: it will be used to instantiate pysat.solvers.Solver as param named bootstrap_with
+        :param preprocess: whether simplify the formula by `minimal_model.preprocess` before computing
+        :param jobs: the count of processes solving variable-disjoint components, default is the count of CPUs
+        :param incremental: keep the pysat solver and the minimal model for the next computing after adding clauses
+        :param deadline: wall clock seconds of a computing, the smallest model found before is returned after them
+        :param memory_watermark: megabytes of resident memory, computing stops like `deadline` above it
         """
-        super().__init__(pysat_name, bootstrap_with)
+        super().__init__(pysat_name, bootstrap_with, preprocess, jobs, incremental, deadline, memory_watermark)
 
-    def compute_minimal_model(self) -> Tuple[bool, List[int]]:
+    def _compute_minimal_model(self) -> Tuple[bool, List[int]]:
         """
         This method is used to  a minimal model,it will return a `tuple`.
         The first value means whether a CNF formula given to the solver is satisfiability
@@ -104,21 +774,27 @@ class MMSolver(_BaseSolver):
         """
         start_cpu_time = minimal_model.utils.get_cpu_time()
         model = None
-        self._pysat_sovlver = pysat.solvers.Solver(self._pysat_name)
-        self._pysat_sovlver.append_formula(self._formula)
+        self._create_pysat_solver()
         self._compute_model_count = 1
-        while self._pysat_sovlver.solve():
-            self._compute_model_count += 1
-            model = self._pysat_sovlver.get_model()
-            positive_list = []
-            for item in model:
-                if item > 0:
-                    positive_list.append(-item)
-                else:
-                    self._pysat_sovlver.add_clause([item])
-            self._pysat_sovlver.add_clause(positive_list)
-        self._cpu_time = minimal_model.utils.get_cpu_time() - start_cpu_time
-        self._pysat_sovlver.delete()
+        try:
+            while self._solve():
+                self._compute_model_count += 1
+                model = self._pysat_sovlver.get_model()
+                positive_list = []
+                for item in model:
+                    if item > 0:
+                        positive_list.append(-item)
+                    else:
+                        self._add_clause([item])
+                self._add_clause(positive_list)
+                if self._out_of_budget():
+                    break
+        except minimal_model.utils.DeadlineReached:
+            if model is None:
+                raise
+        finally:
+            self._cpu_time = minimal_model.utils.get_cpu_time() - start_cpu_time
+            self._delete_pysat_solver()
         return model is not None, model
 
 
@@ -130,7 +806,8 @@ class MRSolver(_BaseSolver):
     """
     names = ["MR"]
 
-    def __init__(self, pysat_name='m22', pysat_check_name='', bootstrap_with=None):
+    def __init__(self, pysat_name='m22', pysat_check_name='', bootstrap_with=None, preprocess=False, jobs=None,
+                 incremental=False, deadline=None, memory_watermark=None):
         """
         It compute minimal model with check. \n When pysat get a model ,this solver will check whether it's a minimal
         model. if it is, solver will return model , otherwise solver will get a new model that is subset of last
@@ -141,10 +818,18 @@ class MRSolver(_BaseSolver):
         be used to instantiate pysat.solvers.Solver for computing as param named bootstrap_with
         :param pysat_check_name The name of  SAT's solver for checking, t will be used to instantiate pysat.solvers.Solver
         for checking as param named pysat_name
+        :param preprocess: whether simplify the formula by `minimal_model.preprocess` before computing
+        :param jobs: the count of processes solving variable-disjoint components, default is the count of CPUs
+        :param incremental: keep the pysat solver and the minimal model for the next computing after adding clauses
+        :param deadline: wall clock seconds of a computing, the smallest model found before is returned after them
+        :param memory_watermark: megabytes of resident memory, computing stops like `deadline` above it
         """
-        super().__init__(pysat_name, bootstrap_with)
+        super().__init__(pysat_name, bootstrap_with, preprocess, jobs, incremental, deadline, memory_watermark)
         self._pysat_check_name = pysat_check_name if pysat_check_name != '' else pysat_name
         self._check_model_count = 0
+        self._check_solver = None
+        self._check_top = 0
+        self._dependency = None
 
     @property
     def check_model_count(self):
@@ -165,16 +850,37 @@ class MRSolver(_BaseSolver):
                 if body:
                     return False
             return True
-        check_solver = pysat.solvers.Solver(self._pysat_check_name)
-
+        if self._check_solver is None:
+            self._check_solver = pysat.solvers.Solver(self._pysat_check_name)
+        # every clause belongs to ts of one component at most, because reduce removes all of its atoms
+        self._check_top += 1
+        selector = self._check_top
         for clause in ts.values():
             if clause:
-                check_solver.add_clause(clause)
-        check_solver.add_clause([-x for x in s])
-        result = check_solver.solve()
-        check_solver.delete()
+                self._check_solver.add_clause([-selector] + clause)
+        self._check_solver.add_clause([-selector] + [-x for x in s])
+        self._stats.count('clauses_added', len(ts) + 2)
+        self._stats.count('sat_calls')
+        result = self._call_pysat(self._check_solver, [selector])
+        self._check_solver.add_clause([-selector])
         return not result
 
+    def _delete_check_solver(self):
+        with self._native_lock:
+            if self._check_solver is not None:
+                self._check_solver.delete()
+                self._check_solver = None
+
+    def _pysat_names(self) -> List[str]:
+        return [self._pysat_name, self._pysat_check_name]
+
+    def _options(self) -> dict:
+        return dict(super()._options(), pysat_check_name=self._pysat_check_name)
+
+    def _native_solvers(self):
+        solvers = super()._native_solvers()
+        return solvers + [self._check_solver] if self._check_solver is not None else solvers
+
     def print_status(self):
         super().print_status()
         print("CheckModelCount       : {} ".format(self.check_model_count))
@@ -182,33 +888,70 @@ class MRSolver(_BaseSolver):
     def _check(self, clauses: list, formula_nv: int, model) -> bool:
         """
         This method is used to check whether the model given in parameters is a minimal model of clauses given in
-        parameters
+        parameters. Neither clauses nor model is changed. The dependency graph is kept for the next check, set
+        `_dependency` to None before checking another formula
         """
         self._check_model_count += 1
-        mr_clauses = mr(clauses, model)
-        graph = create_graph(mr_clauses, formula_nv)
-        scc = StronglyConnectedGraph(graph)
-        node = scc.get_one_empty_indegree()
-        while node:
-            if node is None:
-                break
-            if node > formula_nv:
-                scc.remove(node)
-                node = scc.get_one_empty_indegree()
-                continue
-            s = compute_s(scc.scc_weights[node], formula_nv)
-            ts = compute_ts(mr_clauses, s, formula_nv)
-            if self._compute(ts, s):
-                model = [-x if x in s else x for x in model]
-                mr_clauses = reduce(mr_clauses, s)
-                scc.remove(node)
-                node = scc.get_one_empty_indegree()
-            else:
-                break
+        self._check_top = formula_nv
+        try:
+            if self._dependency is None or not self._dependency.update(model):
+                self._dependency = ReducedDependencyGraph(clauses, formula_nv, model, self._stats)
+            clauses = self._dependency.reduction()
+            scc = self._dependency.scc
+            scc.reset()
+            node = scc.get_one_empty_indegree()
+            while node:
+                if node is None:
+                    break
+                if node > formula_nv:
+                    scc.remove(node)
+                    node = scc.get_one_empty_indegree()
+                    continue
+                if self._interrupted:
+                    raise SolverInterrupted()
+                self._stats.count('sccs_visited')
+                s = compute_s(scc.scc_weights[node], formula_nv)
+                with self._stats.phase('compute'):
+                    ts = clauses.compute_ts(s, formula_nv)
+                    minimal = self._compute(ts, s)
+                if minimal:
+                    model = [-x if x in s else x for x in model]
+                    with self._stats.phase('reduce'):
+                        clauses.reduce(s)
+                    scc.remove(node)
+                    node = scc.get_one_empty_indegree()
+                else:
+                    break
+        finally:
+            self._delete_check_solver()
         header = [x for x in model if x > 0]
         return len(header) == 0
 
-    def compute_minimal_model(self) -> Tuple[bool, List[int]]:
+    def _minimize(self, reducer, model) -> List[int]:
+        """
+        compute a minimal model which is a subset of model, every model is checked before the next one is computed
+        """
+        self._dependency = None
+        try:
+            while not self._check(self._formula_store(), self._formula.nv, model):
+                if self._out_of_budget():
+                    break
+                reducer.reduce(model)
+                self._compute_model_count += 1
+                if not reducer.solve():
+                    break
+                model = self._pysat_sovlver.get_model()[:len(model)]
+        except minimal_model.utils.DeadlineReached:
+            pass
+        finally:
+            self._dependency = None
+        return model
+
+    def iter_minimal_models(self, limit=None) -> Iterator[List[int]]:
+        self._check_model_count = 0
+        return super().iter_minimal_models(limit)
+
+    def _compute_minimal_model(self) -> Tuple[bool, List[int]]:
         """
         This method is used to  a minimal model,it will return a `tuple`.
         The first value means whether a CNF formula given to the solver is satisfiability
@@ -217,23 +960,221 @@ class MRSolver(_BaseSolver):
         """
         start_cpu_time = minimal_model.utils.get_cpu_time()
         model = None
-        formula = copy.deepcopy(self._formula)
+        formula = self._formula
         self._compute_model_count = 1
         self._check_model_count = 0
-        self._pysat_sovlver = pysat.solvers.Solver(self._pysat_name)
-        self._pysat_sovlver.append_formula(self._formula)
-        while self._pysat_sovlver.solve():
-            model = self._pysat_sovlver.get_model()
-            if self._check(formula.clauses, formula.nv, copy.deepcopy(model)):
-                break
-            positive_list = []
-            for item in model:
-                if item > 0:
-                    positive_list.append(-item)
-                else:
-                    self._pysat_sovlver.add_clause([item])
-            self._pysat_sovlver.add_clause(positive_list)
-            self._compute_model_count += 1
-        self._cpu_time = minimal_model.utils.get_cpu_time() - start_cpu_time
-        self._pysat_sovlver.delete()
+        self._dependency = None
+        self._create_pysat_solver()
+        try:
+            while self._solve():
+                model = self._pysat_sovlver.get_model()
+                if self._check(self._formula_store(), formula.nv, model):
+                    break
+                positive_list = []
+                for item in model:
+                    if item > 0:
+                        positive_list.append(-item)
+                    else:
+                        self._add_clause([item])
+                self._add_clause(positive_list)
+                self._compute_model_count += 1
+                if self._out_of_budget():
+                    break
+        except minimal_model.utils.DeadlineReached:
+            if model is None:
+                raise
+        finally:
+            self._cpu_time = minimal_model.utils.get_cpu_time() - start_cpu_time
+            self._delete_pysat_solver()
+            self._dependency = None
         return model is not None, model
+
+
+class SCCSolver(_BaseSolver):
+    """
+        It compute minimal model stratum by stratum. \n
+        After pysat gets a model, the formula is reduced by mr and the strongly connected components of its dependency
+        graph are solved in topological order, every component only with its own clauses reduced by the components
+        solved before. A minimal model is the union of the minimal models of all components.
+    """
+    names = ["SCC"]
+
+    def __init__(self, pysat_name='m22', bootstrap_with=None, preprocess=False, jobs=None, incremental=False,
+                 deadline=None, memory_watermark=None):
+        """
+        :param pysat_name :The name of  SAT's solver, it is used for the first model and every component which isn't
+        Horn
+        :param bootstrap_with: it will be used to instantiate pysat.solvers.Solver as param named bootstrap_with
+        :param preprocess: whether simplify the formula by `minimal_model.preprocess` before computing
+        :param jobs: the count of processes solving variable-disjoint components, default is the count of CPUs
+        :param incremental: keep the pysat solver and the minimal model for the next computing after adding clauses
+        :param deadline: wall clock seconds of a computing, the smallest model found before is returned after them
+        :param memory_watermark: megabytes of resident memory, computing stops like `deadline` above it
+        """
+        super().__init__(pysat_name, bootstrap_with, preprocess, jobs, incremental, deadline, memory_watermark)
+
+    def _solve_stratum(self, ts, s) -> set:
+        """
+        compute a minimal model of the clauses of a component, every clause has a positive atom
+        :param ts: clauses whose atoms are in s
+        :param s: the atoms of the component
+        :return: the true atoms
+        """
+        if len(s) == 1:
+            return set(s) if any(all(x > 0 for x in clause) for clause in ts) else set()
+        if minimal_model.preprocess.is_horn(ts):
+            return minimal_model.preprocess.horn_minimal_model(ts)
+        # atoms are numbered from 1 in the component, so pysat only allocates the atoms of the component
+        atoms = sorted(s)
+        index = {atom: i for (i, atom) in enumerate(atoms, 1)}
+        clauses = [[index[x] if x > 0 else -index[-x] for x in clause] for clause in ts]
+        self._pysat_sovlver = pysat.solvers.Solver(self._pysat_name, bootstrap_with=clauses)
+        self._stats.count('clauses_added', len(clauses))
+        model = None
+        try:
+            while self._solve():
+                self._compute_model_count += 1
+                model = self._pysat_sovlver.get_model()
+                positive_list = []
+                for item in model:
+                    if item > 0:
+                        positive_list.append(-item)
+                    else:
+                        self._add_clause([item])
+                self._add_clause(positive_list)
+        finally:
+            self._delete_pysat_solver()
+        return {atoms[x - 1] for x in model if x > 0}
+
+    def _partial_model(self, model, true, solved) -> List[int]:
+        """
+        the model returned when computing stops before all components are solved, the atoms of components not solved
+        yet keep the values of the pysat model if it is still a model
+        :param model: the pysat model
+        :param true: the true atoms of the solved components
+        :param solved: the atoms of the solved components
+        """
+        partial = true | {x for x in model if x > 0 and x not in solved}
+        if not self._formula_store().satisfied(partial):
+            partial = {x for x in model if x > 0}
+        return [x if x in partial else -x for x in range(1, self._formula.nv + 1)]
+
+    def _compute_minimal_model(self) -> Tuple[bool, List[int]]:
+        """
+        This method is used to  a minimal model,it will return a `tuple`.
+        The first value means whether a CNF formula given to the solver is satisfiability
+        The second value is a minimal model only if the formula is satisfiability, otherwise the value is None\n
+        :return:  (satisfiability,minimal model)
+        """
+        start_cpu_time = minimal_model.utils.get_cpu_time()
+        formula = self._formula
+        formula_nv = formula.nv
+        self._compute_model_count = 1
+        self._create_pysat_solver()
+        try:
+            if not self._solve():
+                return False, None
+            model = self._pysat_sovlver.get_model()
+        finally:
+            self._cpu_time = minimal_model.utils.get_cpu_time() - start_cpu_time
+            self._delete_pysat_solver()
+        try:
+            # mr drops every clause without a positive atom true in the model, so every component is satisfiable
+            with self._stats.phase('mr'):
+                store = self._formula_store().mr(model)
+            with self._stats.phase('graph'):
+                clauses = ClauseReduction(OccurrenceIndex(store))
+                graph = store.create_graph(formula_nv)
+            with self._stats.phase('scc'):
+                scc = StronglyConnectedGraph(graph)
+            true = set()
+            solved = set()
+            node = scc.get_one_empty_indegree()
+            while node is not None:
+                if node > formula_nv:
+                    scc.remove(node)
+                    node = scc.get_one_empty_indegree()
+                    continue
+                if self._interrupted:
+                    raise SolverInterrupted()
+                if self._out_of_budget():
+                    return True, self._partial_model(model, true, solved)
+                self._stats.count('sccs_visited')
+                s = compute_s(scc.scc_weights[node], formula_nv)
+                with self._stats.phase('compute'):
+                    ts = list(clauses.compute_ts(s, formula_nv).values())
+                    try:
+                        positive = self._solve_stratum(ts, s)
+                    except minimal_model.utils.DeadlineReached:
+                        return True, self._partial_model(model, true, solved)
+                solved.update(s)
+                with self._stats.phase('reduce'):
+                    clauses.reduce(positive)
+                    clauses.mr(s - positive)
+                true.update(positive)
+                scc.remove(node)
+                node = scc.get_one_empty_indegree()
+        finally:
+            self._cpu_time = minimal_model.utils.get_cpu_time() - start_cpu_time
+        return True, [x if x in true else -x for x in range(1, formula_nv + 1)]
+
+
+class PortfolioSolver(_BaseSolver):
+    """
+        It compute minimal model by several configurations in separate processes at the same time, the first minimal
+        model is returned and the other processes are killed. `winner` is the configuration which found it.
+    """
+    names = ["PORTFOLIO"]
+    # the raced configurations split components by themselves
+    _split_components = False
+
+    def __init__(self, pysat_name='m22', bootstrap_with=None, configurations=None, timeout=None, preprocess=False,
+                 jobs=None, deadline=None, memory_watermark=None):
+        """
+        :param pysat_name :The name of  SAT's solver, it is only used by `iter_minimal_models`
+        :param bootstrap_with: the clauses of the formula
+        :param configurations: a list of (name, mr, pysat_name), default is
+        `minimal_model.portfolio.DEFAULT_CONFIGURATIONS`
+        :param timeout: wall clock seconds to wait for the first model, None is unlimited
+        :param preprocess: whether simplify the formula by `minimal_model.preprocess` before racing, the residual
+        formula is raced
+        :param jobs: it is kept for the same parameters as other solvers, the raced configurations solve components
+        one by one
+        :param deadline: wall clock seconds of a computing, every configuration returns the smallest model found
+        before when they are used up
+        :param memory_watermark: megabytes of resident memory of every configuration, it stops like `deadline`
+        """
+        super().__init__(pysat_name, bootstrap_with, preprocess, jobs, deadline=deadline,
+                         memory_watermark=memory_watermark)
+        self._configurations = configurations or minimal_model.portfolio.DEFAULT_CONFIGURATIONS
+        self._timeout = timeout
+        self._check_model_count = 0
+        self._winner = None
+
+    @property
+    def check_model_count(self):
+        return self._check_model_count
+
+    @property
+    def winner(self):
+        """
+        the configuration (name, mr, pysat_name) which computed the last minimal model
+        """
+        return self._winner
+
+    def print_status(self):
+        super().print_status()
+        print("CheckModelCount       : {} ".format(self.check_model_count))
+        if self._winner is not None:
+            print("Winner                : {} ".format(minimal_model.portfolio.format_configuration(self._winner)))
+
+    def _compute_minimal_model(self) -> Tuple[bool, List[int]]:
+        """
+        This method is used to  a minimal model,it will return a `tuple`.
+        The first value means whether a CNF formula given to the solver is satisfiability
+        The second value is a minimal model only if the formula is satisfiability, otherwise the value is None\n
+        :return:  (satisfiability,minimal model)
+        """
+        result = self._race(self._configurations, self._timeout)
+        self._winner = result['configuration']
+        return result['sat'], result['model']
@@ -1,6 +1,8 @@
 from typing import List
 
-from minimal_model.graph import Graph
+from minimal_model.clauses import ClauseStore, OccurrenceIndex, ClauseReduction
+from minimal_model.graph import Graph, StronglyConnectedGraph
+from minimal_model.stats import Stats
 
 
 def mr(clauses, model) -> List[List[int]]:
@@ -39,18 +41,18 @@ def create_graph(clauses, formula_nv) -> Graph:
 
 def reduce(clauses, s) -> List[List[int]]:
     """
-    reduce clauses by s
+    reduce clauses by s, clauses given in parameters aren't changed
     :return: new clauses
     """
+    result = []
     for clause in clauses:
         header = {x for x in clause if x > 0}
         if header.intersection(s):
-            clause.clear()
             continue
         c = [x for x in clause if abs(x) not in s]
-        clause.clear()
-        clause.extend(c)
-    return list(filter(None, clauses))
+        if c:
+            result.append(c)
+    return result
 
 
 def compute_ts(clauses, weights, formula_nv) -> dict:
@@ -66,3 +68,61 @@ def compute_ts(clauses, weights, formula_nv) -> dict:
 
 def compute_s(component, limit):
     return {x for x in component if x <= limit}
+
+
+class ReducedDependencyGraph(object):
+    """
+    keep the clauses reduced by mr and the strongly connected graph of their dependency graph between checks. \n
+    When the next model is a subset of the last one, `update` deletes the atoms which became false and the clauses
+    mr drops for them, instead of computing mr and the strongly connected graph again.
+    """
+
+    def __init__(self, clauses, formula_nv, model, stats: Stats = None):
+        """
+        :param clauses: a `ClauseStore` or a list of clauses, it isn't changed
+        :param stats: the `Stats` which records the time of mr, graph and scc
+        """
+        self.formula_nv = formula_nv
+        self.stats = stats if stats is not None else Stats()
+        with self.stats.phase('mr'):
+            store = clauses if isinstance(clauses, ClauseStore) else ClauseStore.from_clauses(clauses)
+            self.store = store.mr(model)
+        self.positive = {x for x in model if x > 0}
+        with self.stats.phase('graph'):
+            self.index = OccurrenceIndex(self.store)
+            self.dropped = bytearray(len(self.store))
+            self.false = bytearray(formula_nv + 1)
+            graph = self.store.create_graph(formula_nv)
+        with self.stats.phase('scc'):
+            self.scc = StronglyConnectedGraph(graph)
+
+    def update(self, model) -> bool:
+        """
+        reduce by a model which is a subset of the last one
+        :return: False if model isn't a subset of the last model, nothing is changed in that case
+        """
+        positive = {x for x in model if x > 0}
+        if not positive.issubset(self.positive):
+            return False
+        graph = self.scc.graph
+        points = []
+        with self.stats.phase('mr'):
+            for atom in self.positive - positive:
+                if atom not in graph:
+                    continue
+                self.false[atom] = 1
+                points.append(atom)
+                # clauses whose body has the atom are satisfied
+                for key in graph.successors(atom):
+                    self.dropped[key - self.formula_nv - 1] = 1
+                    points.append(key)
+        with self.stats.phase('scc'):
+            self.scc.delete(points)
+        self.positive = positive
+        return True
+
+    def reduction(self) -> ClauseReduction:
+        """
+        :return: a view of the clauses reduced by the last model, reducing the view doesn't change this graph
+        """
+        return ClauseReduction(self.index, bytearray(self.dropped), bytearray(self.false))
@@ -0,0 +1,96 @@
+import time
+from contextlib import contextmanager
+
+import minimal_model.utils
+
+PHASES = ('preprocess', 'sat', 'mr', 'graph', 'scc', 'compute', 'reduce')
+
+
+class Stats(object):
+    """
+    the wall time, cpu time and call count of every phase of computing, and some counters. \n
+    The phases are `preprocess`, `sat` (pysat calls computing models), `mr`, `graph` (building dependency graph),
+    `scc`, `compute` (checking a component by `_compute`) and `reduce`. The counters are `residual_clauses`,
+    `components`, `sat_calls`, `clauses_added`, `sccs_visited` and `anytime_stops`.
+    """
+
+    def __init__(self, callback=None):
+        """
+        :param callback: called as `callback(phase, wall_time, cpu_time)` every time a phase ends
+        """
+        self.callback = callback
+        self.phases = {}
+        self.counters = {}
+
+    def reset(self):
+        """
+        clear all phases and counters, the callback is kept
+        """
+        self.phases = {}
+        self.counters = {}
+
+    @contextmanager
+    def phase(self, name):
+        """
+        measure a phase.
+        Example:
+        with stats.phase('sat'):
+            solver.solve()
+        """
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start_wall
+            cpu_time = time.process_time() - start_cpu
+            item = self.phases.get(name)
+            if item is None:
+                item = self.phases[name] = [0, 0.0, 0.0]
+            item[0] += 1
+            item[1] += wall_time
+            item[2] += cpu_time
+            if self.callback is not None:
+                self.callback(name, wall_time, cpu_time)
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def load(self, data: dict):
+        """
+        replace phases and counters by a dict given by `to_dict`, such as the stats of another process
+        """
+        self.phases = {name: [item['calls'], item['wall_time'], item['cpu_time']]
+                       for (name, item) in data.get('phases', {}).items()}
+        self.counters = dict(data.get('counters', {}))
+
+    def merge(self, data: dict):
+        """
+        add the phases and counters of a dict given by `to_dict`, such as the stats of a process solving a component
+        """
+        for (name, item) in data.get('phases', {}).items():
+            phase = self.phases.setdefault(name, [0, 0.0, 0.0])
+            phase[0] += item['calls']
+            phase[1] += item['wall_time']
+            phase[2] += item['cpu_time']
+        for (name, value) in data.get('counters', {}).items():
+            self.count(name, value)
+
+    def to_dict(self) -> dict:
+        """
+        :return: a dict which can be dumped to JSON, the peak RSS is the peak of the whole process
+        """
+        return {'phases': {name: {'calls': calls, 'wall_time': wall_time, 'cpu_time': cpu_time}
+                           for (name, (calls, wall_time, cpu_time)) in self.phases.items()},
+                'counters': dict(self.counters),
+                'peak_rss_mb': minimal_model.utils.get_peak_memory()}
+
+    def __str__(self):
+        lines = []
+        names = sorted(self.phases, key=lambda x: PHASES.index(x) if x in PHASES else len(PHASES))
+        for name in names:
+            (calls, wall_time, cpu_time) = self.phases[name]
+            lines.append('%-22s: %d calls, %g s wall, %g s cpu' % (name, calls, wall_time, cpu_time))
+        for (name, value) in sorted(self.counters.items()):
+            lines.append('%-22s: %d' % (name, value))
+        return '\n'.join(lines)
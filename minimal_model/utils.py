@@ -1,6 +1,18 @@
 import resource
-import psutil
 import os
+import sys
+
+
+class SolverInterrupted(Exception):
+    """
+    raised by computing when `interrupt` of the solver is called
+    """
+
+
+class DeadlineReached(TimeoutError):
+    """
+    raised by computing when the deadline of the solver is reached before any model is found
+    """
 
 
 def limit_memory(max_mem_mb):
@@ -20,14 +32,25 @@ def limit_time(time_lim):
 
 
 def get_cpu_time():
+    """
+    the user and system cpu time of the current process
+    """
     rusage = resource.getrusage(resource.RUSAGE_SELF)
-    return rusage.ru_utime
+    return rusage.ru_utime + rusage.ru_stime
 
 
 def get_used_memory():
+    # psutil is slow to import, and only needed to print status
+    import psutil
     sour = psutil.Process(os.getpid())
     ll = sour.memory_info()
     return ll.rss / 1024. / 1024.
 
 
-
+def get_peak_memory():
+    """
+    the peak RSS of the current process in megabytes
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes on Linux
+    return peak / 1024. / 1024. if sys.platform == 'darwin' else peak / 1024.
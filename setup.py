@@ -10,9 +10,9 @@ setup(
         version=minimal_model.VERSION,   
         description='compute a minimal model',   
         author='', 
-        install_requires=['python-sat','psutil'],
+        install_requires=['python-sat','psutil','numpy'],
         author_email='',  
         url='',  
-        scripts=['cli/minimal_model'],
-        packages=['minimal_model'],
+        scripts=['cli/minimal_model', 'cli/minimal_model_server'],
+        packages=['minimal_model', 'minimal_model.solvers', 'minimal_model.benchmark'],
 )
\ No newline at end of file
@@ -0,0 +1,79 @@
+import time
+import unittest
+
+from minimal_model.batch import solve_clauses
+from minimal_model.benchmark import random_3cnf
+from minimal_model.clauses import ClauseStore
+from minimal_model.solvers import Solver
+from minimal_model.utils import DeadlineReached
+
+CONFIGURATIONS = (('MM', False), ('MR', False), ('SCC', False), ('MM', True), ('MR', True))
+
+
+def satisfied(clauses, model) -> bool:
+    return ClauseStore.from_clauses(clauses).satisfied([x for x in model if x > 0])
+
+
+class AnytimeTest(unittest.TestCase):
+    """
+    a computing stopped by the memory watermark or the deadline returns a model of the original formula
+    """
+
+    def setUp(self):
+        # atoms which only occur negatively are fixed false by preprocessing
+        self.clauses = random_3cnf(300, 1, ratio=3.5)
+
+    def check(self, pysat_name, preprocess, **options):
+        for (name, mr) in CONFIGURATIONS:
+            solver = Solver(name, mr=mr, pysat_name=pysat_name, preprocess=preprocess, **options)
+            solver.append_formula(self.clauses)
+            (sat, model) = solver.compute_minimal_model()
+            self.assertTrue(sat)
+            self.assertTrue(satisfied(self.clauses, model), (name, mr, pysat_name, preprocess))
+            yield solver
+
+    def test_memory_watermark(self):
+        # cadical sets free atoms true by default, the atoms fixed false by preprocessing must stay false
+        for pysat_name in ('cd', 'm22'):
+            for preprocess in (True, False):
+                for solver in self.check(pysat_name, preprocess, memory_watermark=1):
+                    self.assertFalse(solver.proven_minimal)
+                    self.assertGreater(solver.stats.counters['anytime_stops'], 0)
+
+    def test_deadline(self):
+        # the first model of this formula takes longer than the deadline
+        self.clauses = random_3cnf(400, 1, ratio=4.0)
+        for solver in self.check('cd', True, deadline=0.05):
+            self.assertFalse(solver.proven_minimal)
+
+    def test_deadline_interrupts_pysat(self):
+        # minisat takes seconds for the first model of this formula without preprocessing
+        self.clauses = random_3cnf(400, 1, ratio=4.0)
+        for (name, mr) in CONFIGURATIONS:
+            solver = Solver(name, mr=mr, pysat_name='m22', preprocess=False, deadline=0.2)
+            solver.append_formula(self.clauses)
+            start = time.monotonic()
+            with self.assertRaises(DeadlineReached):
+                solver.compute_minimal_model()
+            self.assertLess(time.monotonic() - start, 1.0, (name, mr))
+        record = solve_clauses(self.clauses, 'MM', pysat_name='m22', preprocess=False, deadline=0.2)
+        self.assertEqual(record['status'], 'TIMEOUT')
+
+    def test_portfolio(self):
+        solver = Solver('PORTFOLIO', preprocess=True, memory_watermark=1)
+        solver.append_formula(self.clauses)
+        (sat, model) = solver.compute_minimal_model()
+        self.assertTrue(sat)
+        self.assertTrue(satisfied(self.clauses, model))
+        self.assertFalse(solver.proven_minimal)
+
+    def test_without_budget(self):
+        solver = Solver('MM', pysat_name='cd', preprocess=True)
+        solver.append_formula(self.clauses)
+        (sat, model) = solver.compute_minimal_model()
+        self.assertTrue(solver.proven_minimal)
+        self.assertTrue(solver.is_minimal(model))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from minimal_model.benchmark import compare, run_case
+
+
+def record(status='SATISFIABLE', wall_time=1.0, **fields):
+    return dict({'family': 'horn', 'size': 10, 'seed': 0, 'configuration': 'MM:m22', 'preprocess': False,
+                 'status': status, 'wall_time': wall_time}, **fields)
+
+
+class CompareTest(unittest.TestCase):
+
+    def test_ratio(self):
+        (item,) = compare([record(wall_time=1.5)], [record()])
+        self.assertAlmostEqual(item['ratio'], 1.5)
+        self.assertTrue(item['regression'])
+        (item,) = compare([record(wall_time=0.01)], [record(wall_time=0.02)])
+        self.assertFalse(item['regression'])
+
+    def test_invalid_model(self):
+        for fields in ({'satisfied': False, 'minimal': False}, {'satisfied': True, 'minimal': False}):
+            (item,) = compare([record(**fields)], [record()])
+            self.assertTrue(item['invalid'])
+            self.assertTrue(item['regression'])
+        # records written before models were checked
+        (item,) = compare([record()], [record()])
+        self.assertNotIn('invalid', item)
+
+    def test_status(self):
+        (item,) = compare([record('TIMEOUT')], [record()])
+        self.assertTrue(item['regression'])
+        (item,) = compare([record('UNSATISFIABLE')], [record()])
+        self.assertTrue(item['regression'])
+        self.assertEqual(compare([record()], [record(preprocess=True)]), [])
+
+    def test_run_case(self):
+        result = run_case('horn', 40, 0, ('MR', False, 'm22'))
+        self.assertEqual(result['status'], 'SATISFIABLE')
+        self.assertTrue(result['satisfied'])
+        self.assertTrue(result['minimal'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from minimal_model.benchmark import random_3cnf
+from minimal_model.cache import ResultCache, formula_key
+from minimal_model.solvers import Solver
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(os.path.join(self.directory.name, 'results.sqlite'))
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_formula_key(self):
+        options = {'name': 'MM', 'mr': False}
+        key = formula_key([[1, -2], [3]], options)
+        self.assertEqual(formula_key([[3], [-2, 1, 1], [1, -2]], options), key)
+        self.assertEqual(formula_key([[1, -2], [3]], dict(options, jobs=4, deadline=None)), key)
+        self.assertNotEqual(formula_key([[1, -2], [3]], dict(options, name='MR')), key)
+        self.assertNotEqual(formula_key([[1, 2], [3]], options), key)
+
+    def test_hit_and_miss(self):
+        clauses = random_3cnf(60, 1, ratio=3.0)
+        solver = Solver('MR', pysat_name='m22', cache=self.cache)
+        solver.append_formula(clauses)
+        result = solver.compute_minimal_model()
+        self.assertFalse(solver.cache_hit)
+        self.assertEqual((self.cache.hits, self.cache.misses, len(self.cache)), (0, 1, 1))
+        # the same clauses in another order
+        solver = Solver('MR', pysat_name='m22', cache=self.cache)
+        solver.append_formula(list(reversed(clauses)))
+        self.assertEqual(solver.compute_minimal_model(), result)
+        self.assertTrue(solver.cache_hit)
+        self.assertEqual(solver.stats.counters['cache_hits'], 1)
+        # other options are another key
+        solver = Solver('MM', pysat_name='m22', cache=self.cache)
+        solver.append_formula(clauses)
+        asyncio.run(solver.compute_minimal_model_async())
+        self.assertFalse(solver.cache_hit)
+        self.assertEqual((self.cache.hits, self.cache.misses, len(self.cache)), (1, 2, 2))
+
+    def test_unsatisfiable(self):
+        self.cache.put('key', False, None)
+        self.assertEqual(self.cache.get('key'), (False, None))
+        self.assertIsNone(self.cache.get('other'))
+
+    def test_not_proven_minimal(self):
+        solver = Solver('MM', pysat_name='m22', cache=self.cache, memory_watermark=1)
+        solver.append_formula(random_3cnf(60, 1, ratio=3.0))
+        solver.compute_minimal_model()
+        self.assertFalse(solver.proven_minimal)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        model = [1, -2, 3, 4]
+        # every result takes the bytes of its key and 4 bytes per true atom
+        self.cache.max_size = 3 * (len('a') + 12)
+        for key in ('a', 'b', 'c'):
+            self.cache.put(key, True, model)
+            time.sleep(0.01)
+        self.assertEqual(self.cache.get('a'), (True, model))
+        time.sleep(0.01)
+        self.cache.put('d', True, model)
+        self.assertEqual(len(self.cache), 3)
+        self.assertIsNone(self.cache.get('b'))
+        for key in ('a', 'c', 'd'):
+            self.assertEqual(self.cache.get(key), (True, model))
+
+
+if __name__ == '__main__':
+    unittest.main()
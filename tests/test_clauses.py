@@ -0,0 +1,63 @@
+import random
+import unittest
+
+from minimal_model.clauses import ClauseStore
+from minimal_model.solvers import utils
+
+
+def random_formula(rng, nv, count):
+    """
+    clauses of 1 to 4 literals over atoms 1..nv, literals may repeat in a clause
+    """
+    return [[rng.choice((1, -1)) * rng.randint(1, nv) for _ in range(rng.randint(1, 4))] for _ in range(count)]
+
+
+def random_model(rng, nv):
+    return [x if rng.random() < 0.5 else -x for x in range(1, nv + 1)]
+
+
+class ClauseStoreTest(unittest.TestCase):
+    """
+    `ClauseStore` is compared with the list functions of `minimal_model.solvers.utils` on seeded random formulas
+    """
+
+    def cases(self):
+        for seed in range(30):
+            rng = random.Random(seed)
+            nv = rng.randint(1, 40)
+            clauses = random_formula(rng, nv, rng.randint(0, 120))
+            yield rng, nv, clauses, ClauseStore.from_clauses(clauses)
+
+    def test_mr(self):
+        for (rng, nv, clauses, store) in self.cases():
+            model = random_model(rng, nv)
+            self.assertEqual(store.mr(model).to_clauses(), utils.mr(clauses, model))
+
+    def test_reduce(self):
+        for (rng, nv, clauses, store) in self.cases():
+            s = {x for x in range(1, nv + 1) if rng.random() < 0.3}
+            self.assertEqual(store.reduce(s).to_clauses(), utils.reduce(clauses, s))
+
+    def test_compute_ts(self):
+        for (rng, nv, clauses, store) in self.cases():
+            weights = {x for x in range(1, nv + 1) if rng.random() < 0.7}
+            self.assertEqual(store.compute_ts(weights, nv), utils.compute_ts(clauses, weights, nv))
+
+    def test_create_graph(self):
+        for (rng, nv, clauses, store) in self.cases():
+            graph = utils.create_graph(clauses, nv)
+            compact = store.create_graph(nv)
+            self.assertEqual(set(compact), set(graph))
+            for point in graph:
+                self.assertEqual(set(compact.successors(point)), graph[point])
+
+    def test_mr_of_store(self):
+        for (rng, nv, clauses, store) in self.cases():
+            model = random_model(rng, nv)
+            reduced = store.mr(model)
+            s = {x for x in range(1, nv + 1) if rng.random() < 0.3}
+            self.assertEqual(reduced.reduce(s).to_clauses(), utils.reduce(utils.mr(clauses, model), s))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import random
+import unittest
+
+from minimal_model.clauses import ClauseStore
+from minimal_model.decompose import components, store_components
+from minimal_model.solvers import Solver
+
+
+class DecomposeTest(unittest.TestCase):
+
+    def test_store_components(self):
+        for seed in range(100):
+            rng = random.Random(seed)
+            nv = rng.randint(1, 60)
+            clauses = [[rng.choice((1, -1)) * rng.randint(1, nv) for _ in range(rng.randint(1, 3))]
+                       for _ in range(rng.randint(1, 40))]
+            expected = components(clauses)
+            parts = store_components(ClauseStore.from_clauses(clauses))
+            if len(expected) < 2:
+                self.assertEqual(parts, [], seed)
+            else:
+                self.assertEqual(sorted(parts), sorted(expected), seed)
+
+    def test_chain(self):
+        # labels are propagated along the whole chain
+        store = ClauseStore.from_clauses([[i + 1, -i] for i in range(1, 1000)] + [[1002, 1003]])
+        self.assertEqual(len(set(store.component_labels()[1:1001].tolist())), 1)
+        self.assertEqual([len(atoms) for (atoms, _) in store_components(store)], [1000, 2])
+
+    def test_empty_clause(self):
+        self.assertEqual(store_components(ClauseStore.from_clauses([[1, 2], [], [3]])), [])
+
+    def test_without_preprocessing(self):
+        clauses = [[1, 2], [-1, 3], [4, 5], [-5, -4], [6, 7, -8]]
+        for name in ('MM', 'MR', 'SCC'):
+            solver = Solver(name, pysat_name='m22', bootstrap_with=clauses)
+            (sat, model) = solver.compute_minimal_model()
+            self.assertTrue(sat)
+            self.assertEqual(len(model), 8)
+            self.assertTrue(solver.is_minimal(model))
+            self.assertEqual(solver.stats.counters['components'], 3)
+            self.assertNotIn('preprocess', solver.stats.to_dict()['phases'])
+        solver = Solver('MM', bootstrap_with=clauses + [[-6], [-7], [8]])
+        self.assertEqual(solver.compute_minimal_model(), (False, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
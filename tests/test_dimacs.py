@@ -0,0 +1,64 @@
+import bz2
+import gzip
+import lzma
+import os
+import random
+import tempfile
+import unittest
+
+from minimal_model.dimacs import iter_clauses, read_store
+
+
+def dimacs(clauses, nv) -> bytes:
+    lines = ['c a comment', 'p cnf {} {}'.format(nv, len(clauses))]
+    lines.extend(' '.join(map(str, clause + [0])) for clause in clauses)
+    return '\n'.join(lines).encode()
+
+
+class DimacsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        rng = random.Random(0)
+        self.clauses = [[rng.choice((1, -1)) * rng.randint(1, 300) for _ in range(rng.randint(1, 5))]
+                        for _ in range(200)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, data, opener=open):
+        path = os.path.join(self.directory.name, name)
+        with opener(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_compressed(self):
+        data = dimacs(self.clauses, 300)
+        for (name, opener) in (('f.cnf', open), ('f.cnf.gz', gzip.open), ('f.cnf.bz2', bz2.open),
+                               ('f.cnf.xz', lzma.open), ('f.cnf.unknown', gzip.open)):
+            path = self.write(name, data, opener)
+            self.assertEqual(list(iter_clauses(path)), self.clauses, name)
+            self.assertEqual(read_store(path).to_clauses(), self.clauses, name)
+
+    def test_chunk_boundaries(self):
+        # clauses spanning lines, a comment between them, no final new line and a SATLIB end marker
+        body = b'\n'.join(b' '.join(b'%d' % x for x in clause + [0]) for clause in self.clauses)
+        body = body.replace(b' ', b'\n', 50).replace(b' 0\n', b' 0\nc comment 1 2 0\n', 3)
+        text = b'c a comment\np cnf 300 200\n' + body
+        for data in (text, text + b'\n%\n0\n'):
+            path = self.write('f.cnf', data)
+            for chunk_size in (1, 2, 3, 7, 64, len(data), 1 << 20):
+                self.assertEqual(list(iter_clauses(path, chunk_size)), self.clauses, chunk_size)
+                self.assertEqual(read_store(path, chunk_size).to_clauses(), self.clauses, chunk_size)
+
+    def test_unterminated_clause(self):
+        path = self.write('f.cnf', b'p cnf 3 2\n1 -2 0\n3 2')
+        self.assertEqual(list(iter_clauses(path)), [[1, -2], [3, 2]])
+        self.assertEqual(read_store(path).to_clauses(), [[1, -2], [3, 2]])
+        path = self.write('f.cnf', b'c only a comment')
+        self.assertEqual(list(iter_clauses(path)), [])
+        self.assertEqual(len(read_store(path)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import random
+import unittest
+
+from minimal_model.graph import Graph, StronglyConnectedGraph
+
+
+def random_graph(rng, size, edges) -> Graph:
+    graph = Graph()
+    for point in range(size):
+        if rng.random() < 0.9:
+            graph.add_point(point)
+    points = list(graph)
+    for _ in range(edges):
+        graph.add_point(rng.choice(points), rng.choice(points))
+    return graph
+
+
+def components(graph):
+    """
+    the strongly connected components of graph by reachability, keyed by their minimal point
+    """
+    reach = {}
+    for start in graph:
+        seen = {start}
+        stack = [start]
+        while stack:
+            for end in graph[stack.pop()]:
+                if end not in seen:
+                    seen.add(end)
+                    stack.append(end)
+        reach[start] = seen
+    result = {}
+    for point in graph:
+        members = {x for x in reach[point] if point in reach[x]}
+        result[min(members)] = members
+    return result
+
+
+def condensation(graph):
+    """
+    :return: (components keyed by their minimal point, the keys of the successors of every component)
+    """
+    result = components(graph)
+    key = {x: k for (k, members) in result.items() for x in members}
+    edges = {k: {key[end] for x in members for end in graph[x]} - {k} for (k, members) in result.items()}
+    return result, edges
+
+
+class GraphTest(unittest.TestCase):
+
+    def test_peel(self):
+        for seed in range(40):
+            rng = random.Random(seed)
+            size = rng.randint(2, 30)
+            graph = Graph()
+            edges = set()
+            for _ in range(rng.randint(1, 60)):
+                (start, end) = sorted(rng.sample(range(size), 2))
+                # duplicate edges count once
+                graph.add_point(start, end)
+                edges.add((start, end))
+            points = {x for edge in edges for x in edge}
+            order = []
+            while True:
+                expected = points - {x for (_, x) in edges} - set(order)
+                self.assertEqual(set(graph.empty_indegree()), expected, seed)
+                point = graph.get_one_empty_indegree()
+                if point is None:
+                    break
+                self.assertIn(point, expected, seed)
+                graph.remove(point)
+                order.append(point)
+                edges = {(x, y) for (x, y) in edges if x != point}
+            self.assertFalse(edges, seed)
+            self.assertEqual(list(graph), [])
+
+    def test_remove_predecessor(self):
+        graph = Graph()
+        graph.add_point(1, 2)
+        graph.add_point(2, 3)
+        self.assertEqual(graph.get_one_empty_indegree(), 1)
+        # 2 is removed before its predecessor, then 1 must not keep an edge to it
+        graph.remove(2)
+        self.assertEqual(graph[1], set())
+        self.assertEqual(sorted(graph.empty_indegree()), [1, 3])
+        graph.remove(1)
+        self.assertEqual(graph.get_one_empty_indegree(), 3)
+        graph.add_point(4, 3)
+        self.assertEqual(graph.get_one_empty_indegree(), 4)
+        graph.remove(4)
+        self.assertEqual(graph.get_one_empty_indegree(), 3)
+
+
+class StronglyConnectedGraphTest(unittest.TestCase):
+
+    def assertCondensation(self, scc, graph, message=None):
+        (expected, edges) = condensation(graph)
+        self.assertEqual({k: set(scc.scc_weights[k]) for k in scc}, expected, message)
+        self.assertEqual({k: scc[k] for k in scc}, edges, message)
+        self.assertEqual(set(scc.empty_indegree()), set(edges) - set().union(*edges.values()), message)
+
+    def test_random(self):
+        for seed in range(40):
+            rng = random.Random(seed)
+            graph = random_graph(rng, rng.randint(1, 40), rng.randint(0, 80))
+            self.assertCondensation(StronglyConnectedGraph(graph), graph, seed)
+
+    @staticmethod
+    def peel(scc, limit=None):
+        """
+        remove components with no input edges until none is left or limit components are removed
+        """
+        order = []
+        point = scc.get_one_empty_indegree()
+        while point is not None and len(order) != limit:
+            scc.remove(point)
+            order.append(point)
+            point = scc.get_one_empty_indegree()
+        return order
+
+    def test_delete_and_reset(self):
+        for seed in range(40):
+            rng = random.Random(seed)
+            graph = random_graph(rng, rng.randint(1, 40), rng.randint(0, 80))
+            scc = StronglyConnectedGraph(graph)
+            while list(graph):
+                # every component is peeled once, then reset restores them
+                self.assertEqual(sorted(self.peel(scc)), sorted(components(graph)), seed)
+                self.assertEqual(len(scc), 0)
+                scc.reset()
+                self.assertCondensation(scc, graph, seed)
+                # delete restores the components removed before, points which aren't in the graph are ignored
+                self.peel(scc, rng.randint(0, 2))
+                points = list(graph)
+                deleted = rng.sample(points, rng.randint(1, min(3, len(points))))
+                scc.delete(deleted + [-1, 10 ** 6])
+                for point in deleted:
+                    graph.remove(point)
+                self.assertCondensation(scc, graph, seed)
+
+    def test_long_path(self):
+        # deeper than the recursion limit
+        graph = Graph()
+        size = 20000
+        for point in range(size - 1):
+            graph.add_point(point, point + 1)
+        graph.add_point(size - 1, 0)
+        scc = StronglyConnectedGraph(graph)
+        self.assertEqual(list(scc), [0])
+        self.assertEqual(len(scc.scc_weights[0]), size)
+        graph.add_point(size - 1, size)
+        graph.add_point(size, size + 1)
+        scc = StronglyConnectedGraph(graph)
+        self.assertEqual(sorted(scc), [0, size, size + 1])
+        self.assertEqual(scc.empty_indegree(), [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
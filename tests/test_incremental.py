@@ -0,0 +1,53 @@
+import random
+import unittest
+
+from minimal_model.clauses import ClauseStore
+from minimal_model.solvers import Solver
+
+
+class IncrementalTest(unittest.TestCase):
+    """
+    a solver kept by `incremental` gives minimal models of the formula after every added clause
+    """
+
+    def test_random(self):
+        for name in ('MM', 'MR', 'SCC'):
+            for seed in range(10):
+                rng = random.Random(seed)
+                nv = 30
+                solver = Solver(name, pysat_name='m22', incremental=True)
+                clauses = []
+                for step in range(40):
+                    # atoms above nv are added late, they may be selector literals of the kept pysat solver
+                    top = nv if step < 30 else nv + 10
+                    clause = [rng.choice((1, -1)) * rng.randint(1, top) for _ in range(rng.randint(1, 3))]
+                    clauses.append(clause)
+                    solver.add_clause(clause)
+                    (sat, model) = solver.compute_minimal_model()
+                    reference = Solver('MM', pysat_name='m22', bootstrap_with=clauses)
+                    self.assertEqual(sat, reference.compute_minimal_model()[0], (name, seed, step))
+                    if not sat:
+                        break
+                    self.assertTrue(ClauseStore.from_clauses(clauses).satisfied([x for x in model if x > 0]))
+                    self.assertTrue(solver.is_minimal(model), (name, seed, step))
+
+    def test_kept_model(self):
+        solver = Solver('MM', pysat_name='m22', incremental=True, bootstrap_with=[[1, 2], [-1, 3]])
+        (sat, model) = solver.compute_minimal_model()
+        # the last minimal model satisfies the new clause, so it is still minimal
+        solver.add_clause([x for x in model if x > 0] + [4])
+        self.assertEqual(solver.compute_minimal_model(), (True, model + [-4]))
+        self.assertEqual(solver.stats.counters.get('sat_calls', 0), 0)
+        solver.add_clause([-x for x in model if x > 0])
+        (sat, model) = solver.compute_minimal_model()
+        self.assertTrue(sat)
+        self.assertTrue(solver.is_minimal(model))
+        solver.add_clause([-1])
+        solver.add_clause([-2])
+        self.assertEqual(solver.compute_minimal_model(), (False, None))
+        solver.add_clause([5])
+        self.assertEqual(solver.compute_minimal_model(), (False, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import asyncio
+import unittest
+
+from minimal_model.benchmark import random_3cnf
+from minimal_model.solvers import Solver
+
+
+class InterruptTest(unittest.TestCase):
+    """
+    an interrupt stops only the computing it comes to, later computings of the solver run as usual
+    """
+
+    def test_idle_interrupt(self):
+        for name in ('MM', 'MR', 'SCC'):
+            solver = Solver(name, pysat_name='m22')
+            solver.append_formula([[1, 2], [-1, 3]])
+            solver.interrupt()
+            self.assertEqual(solver.compute_minimal_model(), (True, [-1, 2, -3]))
+            solver.interrupt()
+            self.assertEqual(list(solver.iter_minimal_models()), [[-1, 2, -3], [1, -2, 3]])
+
+    def test_after_async_timeout(self):
+        # minisat takes about half a second for the first model of this formula
+        solver = Solver('MM', pysat_name='m22', preprocess=True)
+        solver.append_formula(random_3cnf(400, 1, ratio=4.0))
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(solver.compute_minimal_model_async(timeout=0.1))
+        (sat, model) = solver.compute_minimal_model()
+        self.assertTrue(sat)
+        self.assertTrue(solver.is_minimal(model))
+
+    def test_options_in_process(self):
+        # cadical can't be interrupted, so the async computing runs in another process with the same parameters
+        for preprocess in (True, False):
+            solver = Solver('MR', pysat_name='cd', pysat_check_name='m22', preprocess=preprocess)
+            solver.append_formula(random_3cnf(100, 1, ratio=3.0))
+            (sat, model) = asyncio.run(solver.compute_minimal_model_async())
+            self.assertTrue(solver.is_minimal(model))
+            self.assertEqual('preprocess' in solver.stats.to_dict()['phases'], preprocess)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import itertools
+import random
+import unittest
+
+from minimal_model.minimality import MinimalityChecker, PARALLEL_MIN_MODELS
+from minimal_model.solvers import Solver
+
+
+def assignments(nv):
+    for values in itertools.product((False, True), repeat=nv):
+        yield {atom for (atom, value) in zip(range(1, nv + 1), values) if value}
+
+
+def satisfies(clauses, true) -> bool:
+    return all(any((x > 0) == (abs(x) in true) for x in clause) for clause in clauses)
+
+
+def random_formula(rng, nv):
+    """
+    literals may repeat in a clause
+    """
+    return [[rng.choice((1, 1, -1)) * rng.randint(1, nv) for _ in range(rng.randint(1, 4))]
+            for _ in range(rng.randint(1, 12))]
+
+
+class MinimalityCheckerTest(unittest.TestCase):
+
+    def test_every_assignment(self):
+        for seed in range(40):
+            rng = random.Random(seed)
+            nv = rng.randint(1, 7)
+            clauses = random_formula(rng, nv)
+            models = [true for true in assignments(nv) if satisfies(clauses, true)]
+            checker = MinimalityChecker(clauses)
+            for true in assignments(nv):
+                result = checker.check([x if x in true else -x for x in range(1, nv + 1)])
+                self.assertEqual(result['satisfied'], satisfies(clauses, true), (seed, true))
+                minimal = result['satisfied'] and not any(other < true for other in models)
+                self.assertEqual(result['minimal'], minimal, (seed, true))
+                if result['smaller'] is not None:
+                    smaller = set(result['smaller'])
+                    self.assertTrue(smaller < true and satisfies(clauses, smaller), (seed, true))
+                else:
+                    self.assertTrue(minimal or not result['satisfied'])
+
+    def test_repeated_literals(self):
+        # a repeated literal is one true literal, so 1 is the only true literal of [1, 1, 2] and [1, 1]
+        checker = MinimalityChecker([[1, 1, 2], [-2, 1, 1]])
+        self.assertEqual(checker.check([1, 2]), {'satisfied': True, 'minimal': False, 'smaller': [1]})
+        # 2 is set false alone, so pysat isn't needed
+        self.assertEqual(checker.stats.counters.get('sat_calls', 0), 0)
+        self.assertEqual(checker.check([1, -2]), {'satisfied': True, 'minimal': True, 'smaller': None})
+
+    def test_check_models_by_processes(self):
+        rng = random.Random(1)
+        nv = 12
+        clauses = random_formula(rng, nv) + [[1, 2, 3], [-1, 4, 5]]
+        models = [[x if rng.random() < 0.5 else -x for x in range(1, nv + 1)]
+                  for _ in range(2 * PARALLEL_MIN_MODELS)]
+        expected = [MinimalityChecker(clauses).check(model) for model in models]
+        self.assertEqual(MinimalityChecker(clauses).check_models(models, jobs=3), expected)
+        solver = Solver('MM', pysat_name='m22', bootstrap_with=clauses)
+        self.assertEqual(solver.check_models(models, jobs=2), expected)
+        (sat, model) = solver.compute_minimal_model()
+        self.assertTrue(solver.check_models([model])[0]['minimal'])
+
+
+if __name__ == '__main__':
+    unittest.main()
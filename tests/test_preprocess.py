@@ -0,0 +1,78 @@
+import itertools
+import random
+import unittest
+
+from minimal_model.preprocess import preprocess, is_horn, horn_minimal_model, expand_model
+
+
+def models(clauses, atoms):
+    """
+    all models of clauses over atoms, every model is the set of its true atoms
+    """
+    atoms = sorted(atoms)
+    for values in itertools.product((False, True), repeat=len(atoms)):
+        true = {atom for (atom, value) in zip(atoms, values) if value}
+        if all(any((x > 0) == (abs(x) in true) for x in clause) for clause in clauses):
+            yield true
+
+
+def minimal_models(clauses, atoms):
+    found = list(models(clauses, atoms))
+    return [true for true in found if not any(other < true for other in found)]
+
+
+class PreprocessTest(unittest.TestCase):
+
+    def test_unit_propagation(self):
+        result = preprocess([[1], [-1, 2], [2, 3, 4], [-2, 3, 5]])
+        self.assertTrue(result.sat)
+        self.assertEqual(result.true, {1, 2})
+        self.assertEqual(sorted(map(sorted, result.clauses)), [[3, 5]])
+        self.assertFalse(preprocess([[1], [-1, 2], [-2]]).sat)
+        self.assertFalse(preprocess([[1, 2], []]).sat)
+
+    def test_pure_literals(self):
+        # 1 never appears positively, then 3 only appears positively in a clause satisfied by -1
+        result = preprocess([[-1, 2, 4], [-1, 3], [-3, 2, 4]])
+        self.assertEqual(result.true, set())
+        self.assertEqual(result.clauses, [])
+
+    def test_tautologies_and_subsumption(self):
+        result = preprocess([[1, -1, 2], [1, 2], [2, 1, 3], [2, 1], [-1, -2]])
+        self.assertEqual(sorted(map(sorted, result.clauses)), [[-2, -1], [1, 2]])
+        result = preprocess([[1, 2], [2, 1, 3], [-1, -2]], subsume=False)
+        self.assertEqual(len(result.clauses), 3)
+
+    def test_horn(self):
+        clauses = [[1], [-1, 2], [-1, -2, 3], [-4, 5], [-3, -5]]
+        self.assertTrue(is_horn(clauses))
+        self.assertEqual(horn_minimal_model(clauses), {1, 2, 3})
+        self.assertIsNone(horn_minimal_model(clauses + [[-3]]))
+        self.assertFalse(is_horn([[1, 2]]))
+        # 4 is set false, so the clause which isn't Horn is satisfied
+        self.assertTrue(preprocess([[1, 2, -4], [-1, 3], [-3, 1]]).horn)
+
+    def test_expand_model(self):
+        self.assertEqual(expand_model({1, 3}, 4), [1, -2, 3, -4])
+        self.assertEqual(expand_model(set(), 0), [])
+
+    def test_minimal_models_kept(self):
+        # a minimal model of the residual clauses with `true` is a minimal model of the formula
+        for seed in range(40):
+            rng = random.Random(seed)
+            nv = rng.randint(1, 8)
+            clauses = [[rng.choice((1, -1)) * rng.randint(1, nv) for _ in range(rng.randint(1, 3))]
+                       for _ in range(rng.randint(0, 14))]
+            expected = minimal_models(clauses, range(1, nv + 1))
+            result = preprocess(clauses)
+            self.assertEqual(result.sat, bool(expected), seed)
+            if not result.sat:
+                continue
+            atoms = {abs(x) for clause in result.clauses for x in clause}
+            for true in minimal_models(result.clauses, atoms):
+                model = expand_model(result.true | true, nv)
+                self.assertIn({x for x in model if x > 0}, expected, seed)
+
+
+if __name__ == '__main__':
+    unittest.main()
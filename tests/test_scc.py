@@ -0,0 +1,55 @@
+import itertools
+import random
+import unittest
+
+from minimal_model.benchmark import positive_cycles, horn_heavy
+from minimal_model.solvers import Solver
+
+
+def minimal_models(clauses, nv):
+    """
+    the minimal models of clauses by enumerating all assignments, every model is the set of its true atoms
+    """
+    found = []
+    for values in itertools.product((False, True), repeat=nv):
+        true = {atom for (atom, value) in zip(range(1, nv + 1), values) if value}
+        if all(any((x > 0) == (abs(x) in true) for x in clause) for clause in clauses):
+            found.append(true)
+    return [true for true in found if not any(other < true for other in found)]
+
+
+class SCCSolverTest(unittest.TestCase):
+
+    def test_random(self):
+        for seed in range(60):
+            rng = random.Random(seed)
+            nv = rng.randint(1, 9)
+            clauses = [[rng.choice((1, 1, -1)) * rng.randint(1, nv) for _ in range(rng.randint(1, 3))]
+                       for _ in range(rng.randint(1, 16))]
+            expected = minimal_models(clauses, nv)
+            for preprocess in (False, True):
+                solver = Solver('SCC', pysat_name='m22', preprocess=preprocess)
+                solver.append_formula(clauses)
+                (sat, model) = solver.compute_minimal_model()
+                self.assertEqual(sat, bool(expected), seed)
+                if sat:
+                    self.assertIn({x for x in model if x > 0}, expected, (seed, preprocess))
+
+    def test_cycles(self):
+        # large strongly connected components are solved by pysat, Horn ones by forward chaining
+        for clauses in (positive_cycles(200, 1), horn_heavy(200, 1)):
+            solver = Solver('SCC', pysat_name='m22')
+            solver.append_formula(clauses)
+            (sat, model) = solver.compute_minimal_model()
+            self.assertTrue(sat)
+            self.assertTrue(solver.is_minimal(model))
+            self.assertTrue(solver.proven_minimal)
+            self.assertGreater(solver.stats.counters['sccs_visited'], 0)
+
+    def test_unsatisfiable(self):
+        solver = Solver('SCC', pysat_name='m22', bootstrap_with=[[1, 2], [-1], [-2]])
+        self.assertEqual(solver.compute_minimal_model(), (False, None))
+
+
+if __name__ == '__main__':
+    unittest.main()